@@ -27,6 +27,7 @@ from .core.database import (
     get_session,
     init_db,
     list_pg_schemas,
+    list_sqlite_dbs,
     set_data_dir,
 )
 from .core.models import (
@@ -63,6 +64,7 @@ __all__ = [
     "describe_databases",
     "filesystem_available",
     "list_pg_schemas",
+    "list_sqlite_dbs",
     # ORM models
     "Directory",
     "DirectoryStats",
@@ -10,6 +10,7 @@ Provides common functionality used by both scan_to_db.py and query_db.py:
 - Common CLI option decorators
 """
 
+import functools
 import re
 from datetime import datetime
 from pathlib import Path
@@ -57,17 +58,36 @@ def create_progress_bar(
     return Progress(*columns, console=console)
 
 
+_DISPLAY_SIZE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+
+
+# Listings repeat the same sizes (0, small files) and dates over and over, so
+# the display formatters are memoized; every argument type they take (int,
+# Decimal, datetime, str, None) is hashable.
+@functools.lru_cache(maxsize=4096)
 def format_size(size_bytes: int | None) -> str:
     """Format byte size to human-readable string."""
     if size_bytes is None:
         return "N/A"
-    for unit in ["B", "KiB", "MiB", "GiB", "TiB", "PiB"]:
+    if isinstance(size_bytes, int):
+        # Integer sizes (the common case): pick the unit from the bit length
+        # and divide once instead of looping.
+        last = len(_DISPLAY_SIZE_UNITS) - 1
+        idx = min(max(0, (abs(size_bytes).bit_length() - 1) // 10), last)
+        scaled = size_bytes / (1 << (10 * idx))
+        if abs(scaled) >= 1024 and idx < last:
+            # Past 2**53 the float quotient can round up to 1024.0.
+            idx += 1
+            scaled /= 1024
+        return f"{scaled:.1f} {_DISPLAY_SIZE_UNITS[idx]}"
+    for unit in _DISPLAY_SIZE_UNITS[:-1]:
         if abs(size_bytes) < 1024:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024
-    return f"{size_bytes:.1f} EiB"
+    return f"{size_bytes:.1f} {_DISPLAY_SIZE_UNITS[-1]}"
 
 
+@functools.lru_cache(maxsize=4096)
 def format_datetime(dt: datetime | str | int | None) -> str:
     """Format datetime for display."""
     if dt is None or dt == 0:
@@ -73,6 +73,11 @@ DynamicHelpCommand = make_dynamic_help_command("fs-scans import")
     is_flag=True,
     help="Enable SQL echo for debugging",
 )
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="cProfile each import pass; stats are written next to the database as <db>.<pass>.prof",
+)
 def import_cmd(
     input_file: Path,
     format_name: str | None,
@@ -84,6 +89,7 @@ def import_cmd(
     workers: int,
     echo: bool,
     replace: bool,
+    profile: bool,
 ):
     """Import filesystem scan logs into SQLite database.
 
@@ -96,6 +102,7 @@ def import_cmd(
       fs-scans import scan.log --format gpfs  # Import with explicit format
       fs-scans import scan.log --workers 4    # Import with parallel workers
       fs-scans import scan.log --replace      # Replace existing database
+      fs-scans import scan.log --profile      # Write per-pass cProfile stats
 
     \b
     Database location precedence:
@@ -133,4 +140,5 @@ def import_cmd(
         progress_interval=progress_interval,
         workers=workers,
         echo=echo,
+        profile=profile,
     )
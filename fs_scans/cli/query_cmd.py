@@ -427,7 +427,7 @@ def query_cmd(
         accessed_after=parsed_after,
         atime_recursive=not atime_non_recursive,
         leaves_only=leaves_only,
-        name_patterns=list(name_patterns) if name_patterns else None,
+        name_patterns=name_patterns or None,
         name_pattern_ignorecase=ignore_case,
         min_size=parsed_min_size,
         max_size=parsed_max_size,
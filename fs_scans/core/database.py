@@ -15,7 +15,7 @@ import re
 import threading
 from pathlib import Path
 
-from sqlalchemy import create_engine, Engine, text
+from sqlalchemy import create_engine, event, Engine, text
 from sqlalchemy.orm import sessionmaker
 
 from .config import FsScanConfig
@@ -27,6 +27,9 @@ _DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
 # Module-level cache for the configured data directory (set via CLI)
 _data_dir_override: Path | None = None
 
+# Data directories already created/verified by get_data_dir() this process.
+_ensured_data_dirs: set[Path] = set()
+
 # Module-level engine cache with thread safety for parallel queries.
 # Keyed by a tuple that captures the backend target (sqlite path, or postgres
 # host/db/schema) so a change of backend or schema yields a distinct engine.
@@ -52,11 +55,15 @@ def get_data_dir() -> Path:
     else:
         data_dir = _DEFAULT_DATA_DIR
 
-    # Create directory if it doesn't exist
-    try:
-        data_dir.mkdir(parents=True, exist_ok=True)
-    except OSError as e:
-        raise OSError(f"Failed to create data directory '{data_dir}': {e}") from e
+    # Create directory if it doesn't exist. Every session resolves its .db
+    # path through here, so only pay the mkdir/stat round-trip once per
+    # directory per process.
+    if data_dir not in _ensured_data_dirs:
+        try:
+            data_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise OSError(f"Failed to create data directory '{data_dir}': {e}") from e
+        _ensured_data_dirs.add(data_dir)
 
     return data_dir
 
@@ -201,6 +208,30 @@ def get_db_url(filesystem: str, schema: str | None = None) -> str:
     return str(get_db_path(filesystem))
 
 
+def _set_sqlite_pragma(dbapi_conn, connection_record):
+    """Tune each new SQLite connection for the read-heavy query workload.
+
+    Registered per-engine inside get_engine() so it never fires on PostgreSQL.
+    Scoped queries are dominated by random B-tree page fetches (recursive
+    CTEs, anc_d{k} index probes), so a larger page cache and memory-mapped
+    reads cut most of the cost.
+
+    - cache_size: 256MB page cache
+    - mmap_size: 1GB memory-mapped I/O
+    - temp_store: Keep sort/CTE temporaries in memory
+
+    journal_mode is left alone: WAL needs write access next to the .db for
+    its -wal/-shm files (published scans are often read-only) and is unsafe
+    on network filesystems. query_only is not set because the importer
+    shares these engines; it applies its own PRAGMAs on top of these.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA cache_size=-262144")  # Negative = kibibytes
+    cursor.execute("PRAGMA mmap_size=1073741824")  # 1GB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 def get_engine(
     filesystem: str,
     echo: bool = False,
@@ -274,11 +305,18 @@ def get_engine(
         if cache_key not in _engine_cache:
             # Ensure parent directory exists
             resolved_path.parent.mkdir(parents=True, exist_ok=True)
-            _engine_cache[cache_key] = create_engine(
+            engine = create_engine(
                 f"sqlite:///{resolved_path}",
                 echo=echo,
-                connect_args={"check_same_thread": False},  # Thread safety for parallel queries
+                connect_args={
+                    "check_same_thread": False,  # Thread safety for parallel queries
+                    # Per-connection prepared-statement cache (default 128):
+                    # scoped queries generate many distinct statements.
+                    "cached_statements": 256,
+                },
             )
+            event.listen(engine, "connect", _set_sqlite_pragma)
+            _engine_cache[cache_key] = engine
         return _engine_cache[cache_key]
 
 
@@ -362,6 +400,21 @@ def list_pg_schemas(database: str | None = None) -> list[str]:
     )
 
 
+def list_sqlite_dbs() -> dict[str, int]:
+    """Return ``{collection: size_bytes}`` for the ``*.db`` files in the data dir.
+
+    One ``os.scandir`` pass: ``DirEntry.stat()`` reuses the directory entry, so
+    discovery plus sizing costs one ``stat`` per file instead of the
+    ``exists()`` + ``stat()`` pair a path-by-path walk would issue.
+    """
+    out: dict[str, int] = {}
+    with os.scandir(get_data_dir()) as entries:
+        for entry in entries:
+            if entry.name.endswith(".db"):
+                out[entry.name[:-3]] = entry.stat().st_size
+    return out
+
+
 def filesystem_available(filesystem: str) -> bool:
     """Backend-aware existence check for a single collection.
 
@@ -378,15 +431,20 @@ def describe_databases() -> list[tuple[str, str, int | None]]:
     Returns a list of ``(name, location, size_bytes_or_None)`` tuples.  Size is
     the .db file size for SQLite and ``None`` for PostgreSQL (not file-backed).
     """
-    from ..queries.query_engine import get_all_filesystems
+    if FsScanConfig.DB_BACKEND == "postgres":
+        return [(fs, get_db_url(fs), None) for fs in list_pg_schemas()]
 
+    data_dir = get_data_dir()
+    sizes = list_sqlite_dbs()
     out: list[tuple[str, str, int | None]] = []
-    for fs in get_all_filesystems():
-        if FsScanConfig.DB_BACKEND == "postgres":
-            out.append((fs, get_db_url(fs), None))
+    for fs in sorted(sizes):
+        path = get_db_path(fs)
+        if path == data_dir / f"{fs}.db":
+            size = sizes[fs]
         else:
-            path = get_db_path(fs)
-            out.append((fs, str(path), path.stat().st_size if path.exists() else 0))
+            # FS_SCAN_DB redirects every collection to a single file.
+            size = path.stat().st_size if path.exists() else 0
+        out.append((fs, str(path), size))
     return out
 
 
@@ -443,10 +501,35 @@ def init_db(filesystem: str, echo: bool = False, db_path: Path | None = None, *,
         return engine
 
     engine = get_engine(filesystem, echo=echo, db_path=db_path)
-    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        _set_sqlite_page_size(conn)
+        Base.metadata.create_all(conn)
+        conn.commit()
     return engine
 
 
+# Page size for SQLite files laid out by init_db. Fewer, fuller B-tree pages
+# speed the importer's bulk inserts and index builds; larger pages would cost
+# query-time point lookups more than they save there.
+_SQLITE_PAGE_SIZE = 16384
+
+
+def _set_sqlite_page_size(conn) -> None:
+    """Give an empty SQLite database the import page size.
+
+    The page size is fixed once the first table is written, so this must run
+    on the connection that creates the tables. A file left behind by an
+    earlier import (tables dropped, pages still allocated) is VACUUMed to
+    apply it, which is cheap with the schema empty. Databases that still
+    hold tables are left as they are.
+    """
+    if conn.exec_driver_sql("SELECT count(*) FROM sqlite_master").scalar():
+        return
+    conn.exec_driver_sql(f"PRAGMA page_size = {_SQLITE_PAGE_SIZE}")
+    if conn.exec_driver_sql("PRAGMA page_count").scalar():
+        conn.exec_driver_sql("VACUUM")
+
+
 def drop_tables(filesystem: str, echo: bool = False, db_path: Path | None = None, *, schema: str | None = None):
     """Drop all tables in the database (within the target schema for postgres).
 
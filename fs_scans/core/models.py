@@ -1,6 +1,7 @@
 """SQLAlchemy ORM models for GPFS scan directory statistics."""
 
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, timedelta
 from sqlalchemy import (
     BigInteger,
     Column,
@@ -157,6 +158,17 @@ class DirStatsAccumulator:
         self.first_uid = None
         self.first_gid = None
 
+    # Workers ship these back to the parent by the tens of thousands per
+    # chunk. A plain tuple state pickles smaller and faster than the default
+    # per-object {slot name: value} dict.
+    def __getstate__(self):
+        return (self.nr_count, self.nr_size, self.nr_atime,
+                self.nr_dirs, self.first_uid, self.first_gid)
+
+    def __setstate__(self, state):
+        (self.nr_count, self.nr_size, self.nr_atime,
+         self.nr_dirs, self.first_uid, self.first_gid) = state
+
 
 class ScanMetadata(Base):
     """Track scan provenance and aggregate totals.
@@ -273,8 +285,9 @@ class AccessHistogram(Base):
     file_count = Column(BigInteger, default=0)
     total_size = Column(BigInteger, default=0)  # allocated bytes
 
+    # owner_uid lookups use the (owner_uid, bucket_index) primary key, so
+    # only the bucket needs its own index.
     __table_args__ = (
-        Index("ix_access_hist_uid", "owner_uid"),
         Index("ix_access_hist_bucket", "bucket_index"),
     )
 
@@ -298,6 +311,11 @@ ATIME_BUCKETS = [
     ("7+ Years", None),          # 7+ years
 ]
 
+# Upper bounds (days) of the closed ATIME_BUCKETS, for bisect. Called once per
+# scanned file, so the lookup stays in C.
+_ATIME_BUCKET_BOUNDS = [max_days for _, max_days in ATIME_BUCKETS if max_days is not None]
+
+
 def classify_atime_bucket(atime: datetime | None, scan_date: datetime) -> int:
     """Classify file's access time into histogram bucket.
 
@@ -311,15 +329,27 @@ def classify_atime_bucket(atime: datetime | None, scan_date: datetime) -> int:
     if atime is None:
         return len(ATIME_BUCKETS) - 1  # Default to oldest bucket
 
-    days_old = (scan_date - atime).days
+    # First bucket whose max_days exceeds the age; past the last bound lands
+    # on the open-ended 7+ years bucket.
+    return bisect_right(_ATIME_BUCKET_BOUNDS, (scan_date - atime).days)
 
-    for idx, (_, max_days) in enumerate(ATIME_BUCKETS):
-        if max_days is None:  # Last bucket (7+ years)
-            return idx
-        if days_old < max_days:
-            return idx
 
-    return len(ATIME_BUCKETS) - 1  # Fallback to oldest bucket
+def atime_bucket_cutoffs(scan_date: datetime) -> list[datetime]:
+    """Precompute the ATIME_BUCKETS boundaries as datetimes for one scan date.
+
+    ``(scan_date - atime).days >= max_days`` holds exactly when
+    ``atime <= scan_date - timedelta(days=max_days)``, so with these cutoffs
+    (ascending) the bucket is ``len(cutoffs) - bisect_left(cutoffs, atime)``,
+    the same index classify_atime_bucket returns, without building a
+    timedelta per file.
+
+    Args:
+        scan_date: Scan timestamp (extracted from filename)
+
+    Returns:
+        Cutoff datetimes, oldest first
+    """
+    return [scan_date - timedelta(days=max_days) for max_days in reversed(_ATIME_BUCKET_BOUNDS)]
 
 
 class SizeHistogram(Base):
@@ -337,8 +367,9 @@ class SizeHistogram(Base):
     file_count = Column(BigInteger, default=0)
     total_size = Column(BigInteger, default=0)  # allocated bytes
 
+    # owner_uid lookups use the (owner_uid, bucket_index) primary key, so
+    # only the bucket needs its own index.
     __table_args__ = (
-        Index("ix_size_hist_uid", "owner_uid"),
         Index("ix_size_hist_bucket", "bucket_index"),
     )
 
@@ -365,6 +396,10 @@ SIZE_BUCKETS = [
 ]
 
 
+# Upper bounds of the closed SIZE_BUCKETS, for bisect (see _ATIME_BUCKET_BOUNDS).
+_SIZE_BUCKET_BOUNDS = [max_size for _, _, max_size in SIZE_BUCKETS if max_size is not None]
+
+
 def classify_size_bucket(size_bytes: int) -> int:
     """Classify file size into histogram bucket.
 
@@ -374,14 +409,9 @@ def classify_size_bucket(size_bytes: int) -> int:
     Returns:
         Bucket index (0-9)
     """
-    for idx, (_, min_size, max_size) in enumerate(SIZE_BUCKETS):
-        if max_size is None:  # Last bucket (100 GiB+)
-            if size_bytes >= min_size:
-                return idx
-        elif min_size <= size_bytes < max_size:
-            return idx
-
-    return len(SIZE_BUCKETS) - 1  # Fallback to largest bucket
+    if size_bytes < 0:
+        return len(SIZE_BUCKETS) - 1  # Fallback to largest bucket
+    return bisect_right(_SIZE_BUCKET_BOUNDS, size_bytes)
 
 
 class HistAccumulator:
@@ -393,3 +423,10 @@ class HistAccumulator:
         self.size_hist = [0] * 10
         self.atime_size = [0] * 10
         self.size_size = [0] * 10
+
+    # Tuple state for cheap pickling, as for DirStatsAccumulator.
+    def __getstate__(self):
+        return (self.atime_hist, self.size_hist, self.atime_size, self.size_size)
+
+    def __setstate__(self, state):
+        self.atime_hist, self.size_hist, self.atime_size, self.size_size = state
@@ -4,10 +4,17 @@ Provides a fluent interface for constructing complex directory queries
 with proper condition building, CTE generation, and parameter management.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+# Bind format for atime cutoffs. The importer binds Python datetimes, which
+# SQLite stores as "YYYY-MM-DD HH:MM:SS" text; binding the cutoff in the same
+# shape keeps the comparison a plain text compare that can seek the atime
+# index (PostgreSQL casts the literal to its timestamp column type).
+_ATIME_BIND_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 # Regex metacharacters to escape when translating a shell glob to a POSIX
 # regex for PostgreSQL.  ``*`` and ``?`` are handled separately as wildcards.
 _REGEX_META = set(r".\+()[]{}^$|")
@@ -70,6 +77,7 @@ class DirectoryQueryBuilder:
     _use_descendants_cte: bool = False
     _sort_by: str = "size_r"
     _limit: int | None = None
+    _full_paths: bool = False
 
     # Target SQL dialect ("sqlite" or "postgresql"); controls dialect-specific
     # operators such as GLOB (sqlite) vs regex `~` (postgresql).
@@ -178,7 +186,7 @@ class DirectoryQueryBuilder:
         """
         col = "s.max_atime_r" if recursive else "s.max_atime_nr"
         self._conditions.append(f"{col} < :accessed_before")
-        self._params["accessed_before"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+        self._params["accessed_before"] = dt.strftime(_ATIME_BIND_FORMAT)
         return self
 
     def with_accessed_after(
@@ -197,12 +205,18 @@ class DirectoryQueryBuilder:
         """
         col = "s.max_atime_r" if recursive else "s.max_atime_nr"
         self._conditions.append(f"{col} > :accessed_after")
-        self._params["accessed_after"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+        self._params["accessed_after"] = dt.strftime(_ATIME_BIND_FORMAT)
         return self
 
     def with_leaves_only(self) -> "DirectoryQueryBuilder":
         """Filter to directories with no subdirectories (leaf nodes).
 
+        Reads the persisted direct-child counter ``dir_count_nr`` (filled in
+        by import pass 2a) rather than probing ``directories`` for children,
+        so the filter is a per-row column test with no correlated subquery.
+        Leaves are usually the bulk of a tree, so no dedicated partial index:
+        the sort/scope index drives the scan and this predicate filters it.
+
         Returns:
             self for chaining
         """
@@ -210,7 +224,7 @@ class DirectoryQueryBuilder:
         return self
 
     def with_name_patterns(
-        self, patterns: list[str], ignore_case: bool = False
+        self, patterns: Sequence[str], ignore_case: bool = False
     ) -> "DirectoryQueryBuilder":
         """Filter by name patterns (OR'd together).
 
@@ -341,13 +355,17 @@ class DirectoryQueryBuilder:
             self._params["max_dirs"] = max_dirs
         return self
 
-    def with_path_prefix_ids(self, ancestor_ids: list[int]) -> "DirectoryQueryBuilder":
+    def with_path_prefix_ids(
+        self, ancestor_ids: list[int], max_depth: int | None = None
+    ) -> "DirectoryQueryBuilder":
         """Filter to descendants of specific directory IDs (OR'd together).
 
         The ancestor_ids should be resolved externally via resolve_path_to_id().
 
         Args:
             ancestor_ids: List of directory IDs of the ancestors
+            max_depth: Stop the recursive walk at this depth (pair with
+                :meth:`with_depth_range`, which filters the same bound)
 
         Returns:
             self for chaining
@@ -370,12 +388,19 @@ class DirectoryQueryBuilder:
                 SELECT dir_id FROM ancestors
                 UNION ALL
                 SELECT d.dir_id FROM directories d
-                JOIN descendants p ON d.parent_id = p.dir_id
+                JOIN descendants p ON d.parent_id = p.dir_id{self._depth_bound(max_depth)}
             )"""
         )
         self._use_descendants_cte = True
         return self
 
+    def _depth_bound(self, max_depth: int | None) -> str:
+        """Recursive-term predicate that stops a subtree walk at *max_depth*."""
+        if max_depth is None:
+            return ""
+        self._params["max_depth"] = max_depth
+        return "\n                WHERE d.depth <= :max_depth"
+
     def with_path_prefix_anc(self, pairs: list[tuple[int, int]]) -> "DirectoryQueryBuilder":
         """Filter to descendants of scopes via the denormalized anc_d{k} columns.
 
@@ -405,6 +430,71 @@ class DirectoryQueryBuilder:
         self._conditions.append("(" + " OR ".join(preds) + ")")
         return self
 
+    def with_exclude_ids(
+        self, excluded_ids: list[int], max_depth: int | None = None
+    ) -> "DirectoryQueryBuilder":
+        """Exclude specific directory IDs and all their descendants.
+
+        The exclusion counterpart to :meth:`with_path_prefix_ids`: the excluded
+        subtrees are walked by a recursive ``excluded`` CTE and removed with a
+        ``NOT EXISTS`` anti-join, so the engine drops them *before* ORDER BY /
+        LIMIT rather than after rows have been fetched into Python.
+
+        Args:
+            excluded_ids: Directory IDs of the excluded subtree roots
+            max_depth: Stop the recursive walk at this depth (rows below it
+                are never listed, so they need not be excluded)
+
+        Returns:
+            self for chaining
+        """
+        if not excluded_ids:
+            return self
+
+        for i, eid in enumerate(excluded_ids):
+            self._params[f"exclude_id_{i}"] = eid
+
+        exclude_params = ", ".join(f":exclude_id_{i}" for i in range(len(excluded_ids)))
+        self._ctes.append(
+            f"""
+            excluded_roots AS (
+                SELECT dir_id FROM directories WHERE dir_id IN ({exclude_params})
+            ),
+            excluded AS (
+                SELECT dir_id FROM excluded_roots
+                UNION ALL
+                SELECT d.dir_id FROM directories d
+                JOIN excluded x ON d.parent_id = x.dir_id{self._depth_bound(max_depth)}
+            )"""
+        )
+        self._conditions.append(
+            "NOT EXISTS (SELECT 1 FROM excluded x WHERE x.dir_id = d.dir_id)"
+        )
+        return self
+
+    def with_exclude_anc(self, pairs: list[tuple[int, int]]) -> "DirectoryQueryBuilder":
+        """Exclude subtrees via the denormalized anc_d{k} columns.
+
+        The fast counterpart to :meth:`with_exclude_ids`: each excluded scope
+        ``(dir_id, level)`` becomes ``(s.anc_d{level} IS NULL OR
+        s.anc_d{level} <> :exclude)`` (AND'd together). The NULL arm keeps rows
+        shallower than ``level``, which can never sit under the excluded scope.
+
+        Args:
+            pairs: ``(dir_id, level)`` per excluded scope; every relative
+                ``level`` already verified inside the indexed band by the caller.
+
+        Returns:
+            self for chaining
+        """
+        for i, (dir_id, level) in enumerate(pairs):
+            key = f"exclude_anc_{i}"
+            self._params[key] = dir_id
+            self._conditions.append(
+                f"(s.anc_d{level} IS NULL OR s.anc_d{level} <> :{key})"
+            )
+        return self
+
     def with_sort(self, sort_by: str) -> "DirectoryQueryBuilder":
         """Set sort order.
 
@@ -429,16 +519,51 @@ class DirectoryQueryBuilder:
         self._limit = limit
         return self
 
+    def with_full_paths(self) -> "DirectoryQueryBuilder":
+        """Resolve each result row's full path inside the same statement.
+
+        The filtered, sorted, limited page becomes a ``page`` CTE and a
+        recursive ``path_cte`` walks up from just those rows to the root, so
+        the listing and its paths come back in one round-trip (with a limit
+        the walk costs O(limit x depth) primary-key probes). The
+        full path is appended as a final ``full_path`` column, and the page is
+        re-sorted on its own columns to keep the requested order.
+
+        Without a limit the page is the whole filtered listing, so the walk
+        is O(rows x depth), the same walk a separate batch path lookup over
+        the fetched ids would do, plus one re-sort of the rows. Rows still
+        stream off the cursor, so this is the expected cost of an unlimited
+        listing with paths.
+
+        Returns:
+            self for chaining
+        """
+        self._full_paths = True
+        return self
+
     def build(self) -> QueryResult:
         """Build the final query and parameters.
 
         Returns:
             QueryResult with sql string and params dictionary
         """
-        # Build CTE clause
-        cte_clause = ""
-        if self._ctes:
-            cte_clause = "WITH RECURSIVE " + ",".join(self._ctes)
+        # Add ORDER BY. Append the unique dir_id as a final tiebreaker so the
+        # ordering is fully deterministic — otherwise rows with equal sort keys
+        # come back in arbitrary (engine-dependent) order, which also makes
+        # LIMIT cut through tie groups differently on SQLite vs PostgreSQL.
+        # Ties stay in ascending dir_id order whatever the sort direction, so
+        # listings keep the order they always had and the multi-filesystem
+        # merge in the facade (stable on the sort key) agrees with it.
+        # Each SORT_MAP entry is "alias.column DIRECTION[, ...]"; split it into
+        # (column, direction) terms once so the full-paths page re-sort below
+        # can name the same columns instead of rewriting the SQL text.
+        sort_spec = self.SORT_MAP.get(self._sort_by, self.SORT_MAP["size_r"])
+        sort_terms = []
+        for term in sort_spec.split(","):
+            qualified, term_direction = term.split()
+            sort_terms.append((qualified, qualified.split(".", 1)[1], term_direction))
+        order_clause = ", ".join(f"{qualified} {d}" for qualified, _, d in sort_terms)
+        order_clause += ", d.dir_id ASC"
 
         # Build SELECT clause based on CTE usage
         if self._use_descendants_cte:
@@ -461,25 +586,51 @@ class DirectoryQueryBuilder:
                 JOIN directory_stats s USING (dir_id)
             """
 
-        # Assemble query
-        query = cte_clause + select_clause
+        query = select_clause
 
         # Add WHERE clause
         if self._conditions:
             query += " WHERE " + " AND ".join(self._conditions)
 
-        # Add ORDER BY. Append the unique dir_id as a final tiebreaker so the
-        # ordering is fully deterministic — otherwise rows with equal sort keys
-        # come back in arbitrary (engine-dependent) order, which also makes
-        # LIMIT cut through tie groups differently on SQLite vs PostgreSQL.
-        order_clause = self.SORT_MAP.get(self._sort_by, self.SORT_MAP["size_r"])
-        query += f" ORDER BY {order_clause}, d.dir_id ASC"
+        query += f" ORDER BY {order_clause}"
 
         # Add LIMIT
         if self._limit:
             query += " LIMIT :limit"
             self._params["limit"] = self._limit
 
+        ctes = list(self._ctes)
+        if self._full_paths:
+            ctes.append(
+                f"""
+            page AS ({query}),
+            path_cte AS (
+                SELECT dir_id AS origin_id, parent_id, name AS path_segment FROM page
+                UNION ALL
+                SELECT c.origin_id, p.parent_id, p.name || '/' || c.path_segment
+                FROM directories p
+                JOIN path_cte c ON c.parent_id = p.dir_id
+            )"""
+            )
+            # Re-apply the sort to the page's own columns (every sort key is a
+            # selected column): CTE output order is not guaranteed, and this
+            # sorts at most `limit` rows.
+            page_order = ", ".join(f"page.{column} {d}" for _, column, d in sort_terms)
+            page_order += ", page.dir_id ASC"
+            query = f"""
+                SELECT page.dir_id, page.parent_id, page.name, page.depth,
+                       page.file_count_nr, page.total_size_nr, page.max_atime_nr, page.dir_count_nr,
+                       page.file_count_r, page.total_size_r, page.max_atime_r, page.dir_count_r,
+                       page.owner_uid, page.owner_gid, '/' || pc.path_segment AS full_path
+                FROM page
+                LEFT JOIN path_cte pc ON pc.origin_id = page.dir_id AND pc.parent_id IS NULL
+                ORDER BY {page_order}
+            """
+
+        # Build CTE clause
+        if ctes:
+            query = "WITH RECURSIVE " + ",".join(ctes) + query
+
         return QueryResult(sql=query, params=self._params)
 
     def reset(self) -> "DirectoryQueryBuilder":
@@ -494,4 +645,5 @@ class DirectoryQueryBuilder:
         self._use_descendants_cte = False
         self._sort_by = "size_r"
         self._limit = None
+        self._full_paths = False
         return self
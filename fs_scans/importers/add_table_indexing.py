@@ -9,7 +9,11 @@ def add_directories_indexing(session):
         task = progress.add_task(desc, total=None)
 
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_directories_parent ON directories(parent_id);"))
-        session.execute(text("CREATE INDEX IF NOT EXISTS ix_directories_depth  ON directories(depth);"))
+        # Covering (depth, parent_id, dir_id): the per-depth passes (2b child
+        # roll-up grouped by parent, 2c parent join) read it index-only, in
+        # parent order, with no temp B-tree. Also serves plain depth lookups.
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_directories_depth_parent ON directories(depth, parent_id, dir_id);"))
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_directories_depth_name ON directories(depth, name);"))
         session.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_dir_parent_name ON directories (parent_id, name);"))
         session.commit()
         progress.update(task, description=f"{desc} [dim]done in {progress.tasks[task].elapsed:.1f}s[/dim]")
@@ -18,21 +22,6 @@ def add_directories_indexing(session):
 
 
 
-def add_directory_stats_nr_indexing(session):
-    with Progress() as progress:
-        desc = "  [green]Indexing directory_stats table..."
-        task = progress.add_task(desc, total=None)
-
-        session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_file_count_nr  ON directory_stats(file_count_nr);"))
-        session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_total_size_nr  ON directory_stats(total_size_nr);"))
-        session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_dir_count_nr   ON directory_stats(dir_count_nr);"))
-        session.commit()
-        progress.update(task, description=f"{desc} [dim]done in {progress.tasks[task].elapsed:.1f}s[/dim]")
-
-    return
-
-
-
 def add_directory_stats_indexing(session):
     with Progress() as progress:
         desc = "  [green]Indexing directory_stats table..."
@@ -44,12 +33,22 @@ def add_directory_stats_indexing(session):
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_file_count_r   ON directory_stats(file_count_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_total_size_r   ON directory_stats(total_size_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_dir_count_r    ON directory_stats(dir_count_r);"))
+        session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_max_atime_r    ON directory_stats(max_atime_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_owner_uid      ON directory_stats(owner_uid);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_owner_gid      ON directory_stats(owner_gid);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_owner_size     ON directory_stats(owner_uid, total_size_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_owner_files    ON directory_stats(owner_uid, file_count_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_group_size     ON directory_stats(owner_gid, total_size_r);"))
         session.execute(text("CREATE INDEX IF NOT EXISTS ix_stats_group_files    ON directory_stats(owner_gid, file_count_r);"))
+        # --single-owner listings sorted by size: the largest directories are
+        # mostly multi-owner (owner_uid NULL), so a plain size-index scan wades
+        # through them before the first match. The predicate must stay
+        # textually in step with DirectoryQueryBuilder.with_single_owner() for
+        # the planner to prove the partial index applies.
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_stats_single_owner_size ON directory_stats(total_size_r) "
+            "WHERE owner_uid IS NOT NULL AND owner_uid != -1;"
+        ))
 
         # Scoped-query (ancestor-at-level) indexes over the selective band of
         # root-relative levels (SCOPE_INDEX_MIN_DEPTH..SCOPE_INDEX_MAX_DEPTH in
@@ -25,6 +25,7 @@ from ..core.database import (
     drop_tables,
 )
 from ..core.models import (
+    ATIME_BUCKETS,
     AccessHistogram,
     Directory,
     DirectoryStats,
@@ -36,6 +37,7 @@ from ..core.models import (
     SizeHistogram,
     HistAccumulator,
     UserInfo,
+    atime_bucket_cutoffs,
     classify_atime_bucket,
     classify_size_bucket,
 )
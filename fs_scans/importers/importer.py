@@ -11,12 +11,12 @@ Parser Requirements:
 
 Multi-Pass Algorithm:
     Pass 1: Directory Discovery
-        Phase 1a: Stream directories to SQLite staging table (parallelizable)
-                  Uses (fileset_id, inode) primary key for fast deduplication
-        Phase 1b: Sort by depth, insert into database, build path_to_id lookup
+        Phase 1a: Single parallel scan of the log: collect directory paths and
+                  accumulate non-recursive stats keyed by parent path
+        Phase 1b: Sort by depth, insert into database, index stats by dir_id
 
     Pass 2: Statistics Accumulation
-        Phase 2a: Re-scan log file, accumulate non-recursive stats only
+        Phase 2a: Write the Phase 1a stats, already indexed by dir_id
         Phase 2b: Bottom-up SQL aggregation to compute recursive stats
 
     Pass 3: Summary Tables
@@ -25,6 +25,9 @@ Multi-Pass Algorithm:
         - Record scan metadata
 """
 
+import cProfile
+from contextlib import contextmanager
+
 from .common_imports import *
 from .file_handling import *
 from .pass1 import *
@@ -35,6 +38,31 @@ from .pass3 import *
 from .add_table_indexing import *
 
 
+@contextmanager
+def _profiled(stage: str, profile_prefix: Path | None):
+    """Run an import stage under cProfile when profiling is enabled.
+
+    The stats are written to ``<profile_prefix>.<stage>.prof`` (readable with
+    ``python -m pstats`` or snakeviz). Only the main process is profiled: the
+    Phase 1a workers' parsing shows up as time waiting on the pool.
+    """
+    if profile_prefix is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        out_path = profile_prefix.with_name(f"{profile_prefix.name}.{stage}.prof")
+        profiler.dump_stats(out_path)
+        console.print(
+            f"    [dim]{stage}: {time.perf_counter() - start:.2f}s, profile: {out_path}[/dim]"
+        )
+
+
 def run_import(
     input_file: Path,
     parser: FilesystemParser,
@@ -45,6 +73,7 @@ def run_import(
     progress_interval: int = 1_000_000,
     workers: int = 1,
     echo: bool = False,
+    profile: bool = False,
 ) -> None:
     """
     Run multi-pass import using the provided parser.
@@ -61,6 +90,8 @@ def run_import(
         progress_interval: Progress report interval (lines)
         workers: Number of parallel workers for parsing
         echo: If True, enable SQL echo for debugging
+        profile: If True, cProfile each pass and write the stats next to
+            the database (<db stem>.<pass>.prof)
     """
     console.print(f"[bold]Filesystem Scan Importer ({parser.format_name.upper()})[/bold]")
     console.print(f"Input: {input_file}")
@@ -96,7 +127,8 @@ def run_import(
     console.print(f"Database: {engine.url}")
     console.print()
 
-    overall_start = time.time()
+    profile_prefix = resolved_db_path.with_suffix("") if profile else None
+    overall_start = time.perf_counter()
 
     # Extract scan date for histogram classification
     scan_date = extract_scan_timestamp(input_file.name)
@@ -108,52 +140,58 @@ def run_import(
 
     try:
         # Pass 1: Discover directories (now parser-agnostic)
-        path_to_id, metadata = pass1_discover_directories(
-            input_file, parser, session, progress_interval, num_workers=workers
-        )
+        # The same scan accumulates the Phase 2a stats, indexed by dir_id.
+        with _profiled("pass1", profile_prefix):
+            stats_by_id, metadata, histograms = pass1_discover_directories(
+                input_file, parser, session, progress_interval, num_workers=workers,
+                scan_date=scan_date,
+            )
 
-        # Pass 2a: Accumulate non-recursive stats (now parser-agnostic)
-        pass2a_nonrecursive_stats(
-            input_file,
-            parser,
-            session,
-            path_to_id,
-            scan_date=scan_date,
-            batch_size=batch_size,
-            progress_interval=progress_interval,
-            total_lines=metadata["total_lines"],
-            num_workers=workers,
-        )
+        # Pass 2a: Write the non-recursive stats gathered in Pass 1
+        with _profiled("pass2a", profile_prefix):
+            pass2a_nonrecursive_stats(
+                session,
+                stats_by_id,
+                histograms,
+                batch_size=batch_size,
+            )
+        del stats_by_id, histograms
 
         # add directory indexing *after* insertions but *before* recursive stats
-        # since we search on directories
-        add_directories_indexing(session)
-        add_directory_stats_nr_indexing(session)
+        # since we search on directories. directory_stats indexes wait until
+        # Passes 2b/2c have finished rewriting its rows.
+        with _profiled("index_directories", profile_prefix):
+            add_directories_indexing(session)
 
         # Pass 2b: Compute recursive stats via bottom-up aggregation (pure SQL)
-        pass2b_aggregate_recursive_stats(session)
+        with _profiled("pass2b", profile_prefix):
+            pass2b_aggregate_recursive_stats(session)
 
         # Pass 2c: Populate denormalized ancestor-at-depth columns (pure SQL).
         # Enables scoped subtree queries via a single indexed equality instead
         # of a recursive parent_id walk.
-        pass2c_populate_ancestor_columns(session)
+        with _profiled("pass2c", profile_prefix):
+            pass2c_populate_ancestor_columns(session)
 
         # add all other directory_stats indexing *after* recursive stats
-        add_directory_stats_indexing(session)
+        with _profiled("index_directory_stats", profile_prefix):
+            add_directory_stats_indexing(session)
 
         # Pass 3: Populate summary tables (parser-agnostic)
-        pass3_populate_summary_tables(session, input_file, filesystem, metadata)
+        with _profiled("pass3", profile_prefix):
+            pass3_populate_summary_tables(session, input_file, filesystem, metadata)
 
         # Finalize database
-        finalize_sqlite_pragmas(session)
+        with _profiled("finalize", profile_prefix):
+            finalize_sqlite_pragmas(session)
 
-        overall_duration = time.time() - overall_start
+        overall_duration = time.perf_counter() - overall_start
 
-        # Get DB file size
-        size_str = "unknown"
-        if resolved_db_path.exists():
-            size_bytes = resolved_db_path.stat().st_size
-            size_str = format_size(size_bytes)
+        # Get DB file size (one stat; no exists() check that can race it)
+        try:
+            size_str = format_size(resolved_db_path.stat().st_size)
+        except OSError:
+            size_str = "unknown"
 
         console.print(f"\n[green bold]Import complete![/green bold]")
         console.print(f"[bold]Total runtime:[/bold] {overall_duration:.2f} seconds")
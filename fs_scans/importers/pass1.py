@@ -1,30 +1,160 @@
 from .common_imports import *
 from ..parsers.base import FilesystemParser
 from .file_handling import *
+from bisect import bisect_left
 
 
-def _worker_parse_chunk(args: tuple[list[str], str, FilesystemParser, datetime | None]) -> tuple[Any, Any, int]:
+# Column order of the Phase 1b row tuples
+_DIRECTORY_COLUMNS = ("dir_id", "parent_id", "name", "depth")
+
+
+def _worker_scan_chunk(args: tuple[list[str], str, FilesystemParser, datetime | None]) -> tuple[Any, Any, int]:
     """
     Worker function to parse a chunk of lines using the provided parser.
 
+    Collects both what Phase 1 needs (directory paths) and the Phase 2a
+    non-recursive stats, so the log is read and parsed only once.
+
     Args:
         args: Tuple of (lines_chunk, parser, scan_date)
 
     Returns:
-        Tuple of (dir_results, None, count of lines processed)
-        - dir_results is list[ParsedEntry], hist_results is None
+        Tuple of (dir_results, hist_results, count of lines processed)
+        - dir_results is (dict[dir_path, depth], dict[parent_path, DirStatsAccumulator])
+        - hist_results is dict[uid, HistAccumulator]
     """
     chunk, parser, scan_date = args
 
-    results = []
-    for line in chunk:
-        parsed = parser.parse_line(line.rstrip("\n"))
-        if parsed and parsed.is_dir:
-            results.append(parsed)
-
-    return results, None, len(chunk)
-
-
+    # Map-Reduce Optimization: Aggregate stats locally in worker
+    # This reduces IPC traffic and main thread load by ~1000x
+    dir_depths = {}
+    results = defaultdict(DirStatsAccumulator)
+    hist_results = defaultdict(HistAccumulator)
+
+    # Hoist global/attribute lookups out of the per-line loop
+    classify_size = classify_size_bucket
+    # Bucket atimes by bisecting datetime cutoffs computed once per chunk
+    # (same result as classify_atime_bucket, no timedelta per file). Without
+    # a scan date every file lands in the oldest bucket.
+    oldest_bucket = len(ATIME_BUCKETS) - 1
+    atime_cutoffs = atime_bucket_cutoffs(scan_date) if scan_date else None
+
+    for parsed in parser.parse_lines(chunk):
+        path = parsed.path
+        # Inline os.path.dirname: rpartition is one C call. "/f" keeps "/" as
+        # its parent and a bare name keeps "", as dirname would.
+        parent, sep, _ = path.rpartition("/")
+        stats = results[parent or sep]
+
+        if parsed.is_dir:
+            # Depth is counted here, in parallel, rather than in the parent
+            dir_depths[path] = path.count("/")
+            # Track directory count for parent
+            stats.nr_dirs += 1
+        else:
+            # Track file stats
+            # Accumulate count and size
+            allocated = parsed.allocated
+            atime = parsed.atime
+            stats.nr_count += 1
+            stats.nr_size += allocated
+
+            # Accumulate atime
+            if atime:
+                cur_max = stats.nr_atime
+                if cur_max is None or atime > cur_max:
+                    stats.nr_atime = atime
+
+            # Accumulate UID (Single pass logic)
+            # None = init, -999 = multiple/conflict, else = single UID
+            p_uid = parsed.uid
+            s_uid = stats.first_uid
+
+            if s_uid is None:
+                stats.first_uid = p_uid
+            elif s_uid != -999 and s_uid != p_uid:
+                stats.first_uid = -999
+
+            # Accumulate GID (Single pass logic)
+            # None = init, -999 = multiple/conflict, else = single GID
+            p_gid = parsed.gid
+            s_gid = stats.first_gid
+
+            if s_gid is None:
+                stats.first_gid = p_gid
+            elif s_gid != -999 and s_gid != p_gid:
+                stats.first_gid = -999
+
+            # NEW: Track histograms per UID (files only)
+            hist = hist_results[p_uid]
+
+            # Classify and update histograms
+            if atime and atime_cutoffs:
+                atime_bucket = oldest_bucket - bisect_left(atime_cutoffs, atime)
+            else:
+                atime_bucket = oldest_bucket
+            hist.atime_hist[atime_bucket] += 1
+            hist.atime_size[atime_bucket] += allocated
+
+            size_bucket = classify_size(allocated)
+            hist.size_hist[size_bucket] += 1
+            hist.size_size[size_bucket] += allocated
+
+    return (dir_depths, results), hist_results, len(chunk)
+
+
+def merge_dir_stats(upd: DirStatsAccumulator, w_stats: DirStatsAccumulator) -> None:
+    """Merge one worker's per-directory accumulator into the running total."""
+    upd.nr_count += w_stats.nr_count
+    upd.nr_size += w_stats.nr_size
+    upd.nr_dirs += w_stats.nr_dirs
+
+    # Merge max atime
+    if w_stats.nr_atime:
+        upd.nr_atime = max(upd.nr_atime, w_stats.nr_atime) if upd.nr_atime else w_stats.nr_atime
+
+    # Merge UID logic
+    w_uid = w_stats.first_uid
+    m_uid = upd.first_uid
+
+    if m_uid == -999:
+        pass
+    elif w_uid == -999:
+        upd.first_uid = -999
+    elif w_uid is not None:
+        if m_uid is None:
+            upd.first_uid = w_uid
+        elif m_uid != w_uid:
+            upd.first_uid = -999
+
+    # Merge GID logic (identical to UID)
+    w_gid = w_stats.first_gid
+    m_gid = upd.first_gid
+
+    if m_gid == -999:
+        pass
+    elif w_gid == -999:
+        upd.first_gid = -999
+    elif w_gid is not None:
+        if m_gid is None:
+            upd.first_gid = w_gid
+        elif m_gid != w_gid:
+            upd.first_gid = -999
+
+
+def merge_histograms(main_histograms: dict, hist_results: dict) -> None:
+    """Add one worker's per-UID histograms into the running totals."""
+    for uid, w_hist in hist_results.items():
+        main_hist = main_histograms.get(uid)
+        if main_hist is None:
+            # First time this UID is seen: adopt the worker's accumulator
+            main_histograms[uid] = w_hist
+            continue
+        for i in range(10):
+            main_hist.atime_hist[i] += w_hist.atime_hist[i]
+            main_hist.atime_size[i] += w_hist.atime_size[i]
+            main_hist.size_hist[i] += w_hist.size_hist[i]
+            main_hist.size_size[i] += w_hist.size_size[i]
 
 
 def pass1_discover_directories(
@@ -33,12 +163,21 @@ def pass1_discover_directories(
     session,
     progress_interval: int = 1_000_000,
     num_workers: int = 1,
-) -> tuple[dict[str, int], dict]:
+    scan_date: datetime | None = None,
+) -> tuple[list, dict, dict]:
     """
     First pass: identify all directories and build hierarchy.
 
-    Phase 1a: Scan file in parallel, build in-memory path→depth dict
-    Phase 1b: Sort by depth, insert to directories table, reuse dict for path→dir_id
+    Phase 1a: Scan file in parallel, build in-memory path→depth dict, and
+              accumulate the Phase 2a non-recursive stats in the same scan
+    Phase 1b: Sort by depth, insert to directories table, and move each
+              directory's stats into a list indexed by its new dir_id
+
+    The stats stay keyed by parent path until Phase 1b assigns dir_ids,
+    which costs one accumulator per non-empty directory in memory but saves
+    a second read and parse of the whole log. Phase 1b only keeps path→dir_id
+    for the previous depth (the only possible parents), so no path strings
+    outlive Pass 1.
 
     Args:
         input_file: Path to the log file
@@ -46,11 +185,14 @@ def pass1_discover_directories(
         session: SQLAlchemy session
         progress_interval: Report progress every N lines
         num_workers: Number of worker processes for parsing (Phase 1a only)
+        scan_date: Scan timestamp (for histogram classification)
 
     Returns:
         Tuple of:
-        - Dictionary mapping full paths to dir_id
-        - Metadata dict with total_lines, dir_count, inferred file_count
+        - List of DirStatsAccumulator (None for no files) indexed by dir_id
+        - Metadata dict with total_lines, dir_count, file_count
+        - Histograms dict (uid -> HistAccumulator)
+        The list and histograms are the inputs of pass2a_nonrecursive_stats().
     """
     console.print(f"[bold]Pass 1:[/bold] Discovering directories ({num_workers} workers)...")
 
@@ -58,11 +200,12 @@ def pass1_discover_directories(
     console.print("  [bold]Phase 1a:[/bold] Scanning for directories...")
 
     # In-memory structure replaces staging_dirs table
-    path_to_depth = {}  # {path: depth} - will become path_to_id later
+    path_to_depth = {}  # {path: depth}
+    dir_stats = {}  # {parent_path: DirStatsAccumulator}
+    histograms = {}  # {uid: HistAccumulator}
 
     line_count = 0
-    CHUNK_BYTES = 32 * 1024 * 1024  # 32MB chunks for efficient reading
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     with create_progress_bar(
         extra_columns=[TextColumn("[cyan]{task.fields[dirs]} directories")]
@@ -78,31 +221,50 @@ def pass1_discover_directories(
             nonlocal line_count
             if estimated_lines is not None:
                 line_count = estimated_lines
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             rate = int(line_count / elapsed) if elapsed > 0 else 0
             progress.update(task, dirs=f"{len(path_to_depth):,}", rate=f"{rate:,}")
 
-        def process_parsed_dirs(results):
-            """Merge parsed directories into in-memory dict."""
-            if results is None or not results[0]:
+        def process_scan_results(results):
+            """Merge a worker's directories and stats into the in-memory dicts."""
+            if results is None:
                 return
 
-            dir_results, _ = results  # Extract dir_results from tuple
-            for parsed in dir_results:
-                # Dict key automatically handles deduplication
-                path_to_depth[parsed.path] = parsed.path.count('/')
-
-        # Parallel Phase 1a - no flush needed, everything stays in memory
+            (dir_depths, w_dir_stats), hist_results = results
+            # Every directory path arrives twice per scan, as a directory
+            # record and as its files' parent, and each worker result carries
+            # fresh copies. Interning makes path_to_depth and dir_stats share
+            # one string per directory instead of holding two.
+            intern = sys.intern
+            local_depths = path_to_depth
+            for path, depth in dir_depths.items():
+                local_depths[intern(path)] = depth
+
+            # Performance Optimization: Alias for speed in tight loop
+            # Workers already combined their chunk per directory (map-side
+            # combine); a directory whose entries all fell in one chunk just
+            # adopts that worker's accumulator, with no allocation or merge.
+            local_stats = dir_stats
+            for parent_path, w_stats in w_dir_stats.items():
+                upd = local_stats.get(parent_path)
+                if upd is None:
+                    local_stats[intern(parent_path)] = w_stats
+                else:
+                    merge_dir_stats(upd, w_stats)
+
+            if hist_results:
+                merge_histograms(histograms, hist_results)
+
+        # Parallel Phase 1a - everything stays in memory until Phase 1b
         line_count = run_parallel_file_processing(
             input_file=input_file,
             parser=parser,
             num_workers=num_workers,
-            chunk_bytes=CHUNK_BYTES,
-            worker_parse_chunk=_worker_parse_chunk,
-            process_results_fn=process_parsed_dirs,
+            chunk_bytes=auto_chunk_bytes(input_file.stat().st_size, num_workers),
+            worker_parse_chunk=_worker_scan_chunk,
+            process_results_fn=process_scan_results,
             progress_callback=update_progress,
-            flush_callback=None,  # No flush needed!
-            should_flush_fn=None,
+            scan_date=scan_date,
         )
 
         update_progress()
@@ -111,83 +273,87 @@ def pass1_discover_directories(
     console.print(f"    Lines scanned: {line_count:,}")
     console.print(f"    Found {len(path_to_depth):,} unique directories")
 
-    # Estimate file count (excluding headers and directories)
-    estimated_files = max(0, line_count - len(path_to_depth) - 50)
-    console.print(f"    Inferred ~{estimated_files:,} files")
 
-    # Phase 1b: Insert directories depth-by-depth, reusing path_to_depth dict
+    # Phase 1b: Insert directories depth-by-depth
     console.print("  [bold]Phase 1b:[/bold] Inserting into database...")
 
-    # Sort paths by depth (O(N log N) - more efficient than O(N*D) dict scans)
-    sorted_paths = sorted(path_to_depth.keys(), key=lambda p: path_to_depth[p])
-
-    # Determine starting ID (0 if empty, else max+1)
-    # FIXME - should be empty, confirm later.
-    max_id = session.execute(
-        text("SELECT COALESCE(MAX(dir_id), -1) FROM directories")
-    ).scalar()
-    current_dir_id = max_id + 1
-    assert 0 == current_dir_id
+    # Bucket paths by depth (O(N), no sort). Within a depth they keep their
+    # discovery order. A list slot per path is far smaller than a sorted
+    # list of (path, depth) tuples.
+    paths_by_depth = defaultdict(list)
+    for p, depth in path_to_depth.items():
+        paths_by_depth[depth].append(p)
+    dir_count = len(path_to_depth)
+    path_to_depth.clear()
+
+    # run_import drops and recreates the tables, so directories is empty and
+    # ids start at 0. They are assigned here and inserted explicitly rather
+    # than read back from the database; a leftover row would fail loudly on
+    # the primary key instead of shifting every id.
+    current_dir_id = 0
 
     with create_progress_bar(show_rate=False) as progress:
         task = progress.add_task(
             "[green]Inserting directories...",
-            total=len(path_to_depth),
+            total=dir_count,
         )
 
         insert_batch_size = 25_000
         dir_inserts = []
-        stats_inserts = []
-
-        for p in sorted_paths:
-            depth = path_to_depth[p]  # Retrieve depth before overwriting
-            parent_path, _, name = p.rpartition('/')
-            if not name:  # Root case
-                name = p
-
-            # Parent lookup: parent must have been processed already (lower depth)
-            parent_id = path_to_depth.get(parent_path) if parent_path else None
-
-            # Assign ID and update map
-            dir_id = current_dir_id
-            current_dir_id += 1
-            path_to_depth[p] = dir_id
-
-            dir_inserts.append({
-                "dir_id": dir_id,
-                "parent_id": parent_id,
-                "name": name,
-                "depth": depth,
-            })
-
-            stats_inserts.append({"dir_id": dir_id})
-
-            # Flush batch
-            if len(dir_inserts) >= insert_batch_size:
-                session.execute(insert(Directory), dir_inserts)
-                session.execute(insert(DirectoryStats), stats_inserts)
-                session.commit()
-                progress.update(task, advance=len(dir_inserts))
-                dir_inserts = []
-                stats_inserts = []
+        # dir_ids are assigned consecutively from 0, so the stats list index
+        # is the dir_id. Parents sit exactly one level up: only the previous
+        # depth's path→dir_id map is kept.
+        stats_by_id = []
+        parent_ids = {}  # {path: dir_id} at depth - 1
+
+        for depth in sorted(paths_by_depth):
+            level_ids = {}  # {path: dir_id} at this depth
+            for p in paths_by_depth.pop(depth):
+                parent_path, _, name = p.rpartition('/')
+                if not name:  # Root case
+                    name = p
+
+                # Parent lookup: parent must have been processed already (lower depth)
+                parent_id = parent_ids.get(parent_path) if parent_path else None
+
+                # Assign ID and record it for the next depth's children
+                dir_id = current_dir_id
+                current_dir_id += 1
+                level_ids[p] = dir_id
+                stats_by_id.append(dir_stats.pop(p, None))
+
+                dir_inserts.append((dir_id, parent_id, name, depth))
+
+                # Flush batch
+                if len(dir_inserts) >= insert_batch_size:
+                    bulk_insert_rows(session, "directories", _DIRECTORY_COLUMNS, dir_inserts)
+                    progress.update(task, advance=len(dir_inserts))
+                    dir_inserts = []
+
+            # Only this depth can hold the next depth's parents
+            parent_ids = level_ids
 
         # Flush remaining
         if dir_inserts:
-            session.execute(insert(Directory), dir_inserts)
-            session.execute(insert(DirectoryStats), stats_inserts)
-            session.commit()
+            bulk_insert_rows(session, "directories", _DIRECTORY_COLUMNS, dir_inserts)
             progress.update(task, advance=len(dir_inserts))
 
-    console.print(f"    Inserted {len(path_to_depth):,} directories")
+        # Single transaction for all of Phase 1b
+        session.commit()
+
+    console.print(f"    Inserted {dir_count:,} directories")
 
-    # path_to_depth is now actually path_to_id (depths overwritten with dir_ids)
-    path_to_id = path_to_depth
+    # Count only files whose parent got a dir_id; whatever is left in
+    # dir_stats belongs to parents with no directory line in the log, and
+    # those files are never written to directory_stats either.
+    file_count = sum(stats.nr_count for stats in stats_by_id if stats is not None)
+    console.print(f"    Found {file_count:,} files")
 
     # Return metadata
     metadata = {
         "total_lines": line_count,
-        "dir_count": len(path_to_id),
-        "estimated_files": estimated_files,
+        "dir_count": dir_count,
+        "file_count": file_count,
     }
 
-    return path_to_id, metadata
+    return stats_by_id, metadata, histograms
@@ -10,7 +10,15 @@ def pass2b_aggregate_recursive_stats(session) -> None:
     Processes directories by depth, from deepest to shallowest.
     Each directory's recursive stats = its non-recursive stats + sum of children's recursive stats.
 
-    Optimized to use SQLite 'UPDATE FROM' (requires SQLite 3.33+).
+    Phase 2a inserts every row with its recursive columns already equal to
+    the non-recursive ones (which is final for leaves), so each depth needs
+    only the one UPDATE that folds in the children.
+
+    Optimized to use SQLite 'UPDATE FROM' (requires SQLite 3.33+). Each
+    UPDATE reads only its own depth through ix_directories_depth_parent, so
+    the whole roll-up touches every row a constant number of times; a single
+    recursive CTE would instead have to expand every ancestor/descendant
+    pair (O(dirs x depth) rows) to do the same sums.
     """
     console.print("  [bold]Phase 2b:[/bold] Computing recursive statistics...")
 
@@ -22,28 +30,14 @@ def pass2b_aggregate_recursive_stats(session) -> None:
     with create_progress_bar(show_rate=False) as progress:
         task = progress.add_task(
             "[green]Aggregating by depth...",
-            total=max_depth,
+            total=max(max_depth - 1, 0),
         )
 
-        # Process from leaves (max_depth) down to root (depth=1)
-        for depth in range(max_depth, 0, -1):
-            # 1. Initialize recursive stats with non-recursive stats for this level
-            #    (This covers leaf nodes and prepares parents for accumulation)
-            session.execute(
-                text("""
-                UPDATE directory_stats
-                SET
-                    file_count_r = file_count_nr,
-                    total_size_r = total_size_nr,
-                    max_atime_r = max_atime_nr,
-                    dir_count_r = dir_count_nr
-                WHERE dir_id IN (SELECT dir_id FROM directories WHERE depth = :depth)
-                """),
-                {"depth": depth},
-            )
-
-            # 2. Accumulate stats from children (depth + 1) using UPDATE FROM
-            #    (Only updates parents that actually have children)
+        # Process parents from the deepest level that can have children
+        # (max_depth - 1) up to root (depth=1)
+        for depth in range(max_depth - 1, 0, -1):
+            # Accumulate stats from children (depth + 1) using UPDATE FROM
+            # (Only updates parents that actually have children)
             session.execute(
                 text("""
                 WITH child_agg AS (
@@ -125,8 +119,9 @@ def pass2b_aggregate_recursive_stats(session) -> None:
                 """),
                 {"child_depth": depth + 1},
             )
-
-            session.commit()
             progress.update(task, advance=1)
 
+        # One transaction for the whole roll-up, as for the other phases
+        session.commit()
+
     console.print(f"    Processed {max_depth} depth levels")
@@ -79,7 +79,10 @@ def pass2c_populate_ancestor_columns(session) -> None:
                     {"depth": depth},
                 )
 
-            session.commit()
             progress.update(task, advance=1)
 
+        # One transaction for the whole phase rather than a Session commit
+        # (and fresh transaction) per depth
+        session.commit()
+
     console.print(f"    Populated ancestor columns up to level {effective}")
@@ -61,15 +61,14 @@ def pass3_populate_summary_tables(
             })
             user_count += 1
 
-        # Bulk upsert
-        for item in user_inserts:
-            session.execute(
-                text("""
-                    INSERT OR REPLACE INTO user_info (uid, username, full_name)
-                    VALUES (:uid, :username, :full_name)
-                """),
-                item,
-            )
+        # Bulk upsert: one executemany rather than a statement per row
+        session.execute(
+            text("""
+                INSERT OR REPLACE INTO user_info (uid, username, full_name)
+                VALUES (:uid, :username, :full_name)
+            """),
+            user_inserts,
+        )
         session.commit()
 
     console.print(f"    Resolved {user_count} unique UIDs")
@@ -93,15 +92,14 @@ def pass3_populate_summary_tables(
             })
             group_count += 1
 
-        # Bulk upsert
-        for item in group_inserts:
-            session.execute(
-                text("""
-                    INSERT OR REPLACE INTO group_info (gid, groupname)
-                    VALUES (:gid, :groupname)
-                """),
-                item,
-            )
+        # Bulk upsert: one executemany rather than a statement per row
+        session.execute(
+            text("""
+                INSERT OR REPLACE INTO group_info (gid, groupname)
+                VALUES (:gid, :groupname)
+            """),
+            group_inserts,
+        )
         session.commit()
 
     console.print(f"    Resolved {group_count} unique GIDs")
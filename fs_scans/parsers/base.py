@@ -4,16 +4,19 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, TextIO
+from typing import Iterable, Iterator, TextIO
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedEntry:
     """Normalized entry from any filesystem scan format.
 
     This dataclass represents a single file or directory entry parsed from
     a filesystem scan log. Different parsers will extract this information
     from different log formats (GPFS, Lustre, POSIX, etc.).
+
+    One is created per scanned line, so it uses __slots__ rather than a
+    per-instance __dict__ (smaller, faster to build and to pickle).
     """
 
     path: str
@@ -55,7 +58,8 @@ class FilesystemParser(ABC):
     2. Implement format_name property (returns unique format identifier)
     3. Implement can_parse() method (auto-detection logic)
     4. Implement parse_line() method (parse a single log line)
-    5. Optionally override parse_file() for non-line-based formats
+    5. Optionally override parse_file() for non-line-based formats, or
+       parse_lines() to pre-filter whole chunks cheaply
     6. Register the parser with register_parser() in parsers/__init__.py
     """
 
@@ -118,3 +122,21 @@ class FilesystemParser(ABC):
             entry = self.parse_line(line.rstrip('\n'))
             if entry:
                 yield entry
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[ParsedEntry]:
+        """Parse a chunk of raw lines (default implementation).
+
+        Import workers hand over whole chunks so a parser can reject lines in
+        bulk before calling parse_line() on each one.
+
+        Args:
+            lines: Lines from the log file (trailing newlines allowed)
+
+        Yields:
+            ParsedEntry objects for each successfully parsed entry
+        """
+        parse_line = self.parse_line
+        for line in lines:
+            entry = parse_line(line.rstrip("\n"))
+            if entry:
+                yield entry
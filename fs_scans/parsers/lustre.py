@@ -15,15 +15,41 @@ LINE_PATTERN = re.compile(
     r"(.+)$"  # path
 )
 
-# Regex patterns for extracting individual fields
-FIELD_PATTERNS = {
-    "size": re.compile(r"s=(\d+)"),
-    "blocks": re.compile(r"b=(\d+)"),
-    "user_id": re.compile(r"u=(\d+)"),
-    "group_id": re.compile(r"g=(\d+)"),
-    "file_type": re.compile(r"type=([df])"),
-    "atime": re.compile(r"a=(\d+)"),
-}
+# Single anchored pattern for the field order bin/lustre_scan.sh emits
+# (s b u g p type perm a m c). One match pulls every required field; lines in
+# any other order fall back to LINE_PATTERN and a key=value split.
+RECORD_PATTERN = re.compile(
+    r"0x[0-9a-f]+:0x[0-9a-f]+:0x[0-9a-f]+ "  # FID (hex triplet)
+    r"s=(\d+) b=(\d+) u=(\d+) g=(\d+) p=\S* type=([df]) perm=\S* a=(\d+) "
+    r"m=\S* c=\S* -- (.+)"
+)
+
+# Keys of the required fields, in RECORD_PATTERN group order.
+REQUIRED_FIELDS = ("s", "b", "u", "g", "type", "a")
+
+
+def _match_any_order(line: str) -> tuple[str, ...] | None:
+    """Fallback for records whose fields are not in the RECORD_PATTERN order.
+
+    The field section is split into key=value tokens in one pass, rather
+    than searched once per field. Returns the same string groups as
+    RECORD_PATTERN, or None if the line is malformed or a required field is
+    missing or not numeric.
+    """
+    match = LINE_PATTERN.match(line)
+    if not match:
+        return None
+    fields_str, path = match.groups()
+    fields = dict(token.partition("=")[::2] for token in fields_str.split())
+    try:
+        size, blocks, uid, gid, file_type, atime = (fields[key] for key in REQUIRED_FIELDS)
+    except KeyError:
+        return None
+    if file_type not in ("d", "f"):
+        return None
+    if not all(value.isdecimal() for value in (size, blocks, uid, gid, atime)):
+        return None
+    return size, blocks, uid, gid, file_type, atime, path
 
 
 class LustreParser(FilesystemParser):
@@ -70,34 +96,22 @@ class LustreParser(FilesystemParser):
         Returns:
             ParsedEntry if the line was successfully parsed, None to skip
         """
-        # Match overall line structure
-        match = LINE_PATTERN.match(line)
-        if not match:
-            return None
-
-        fields_str, path = match.groups()
-
-        # Extract required fields
-        size_match = FIELD_PATTERNS["size"].search(fields_str)
-        blocks_match = FIELD_PATTERNS["blocks"].search(fields_str)
-        user_match = FIELD_PATTERNS["user_id"].search(fields_str)
-        group_match = FIELD_PATTERNS["group_id"].search(fields_str)
-        type_match = FIELD_PATTERNS["file_type"].search(fields_str)
-        atime_match = FIELD_PATTERNS["atime"].search(fields_str)
-
-        # Validate all required fields are present
-        if not all([size_match, blocks_match, user_match, group_match, type_match, atime_match]):
-            return None
+        match = RECORD_PATTERN.match(line)
+        if match:
+            size, blocks, uid, gid, file_type, atime_timestamp, path = match.groups()
+        else:
+            groups = _match_any_order(line)
+            if groups is None:
+                return None
+            size, blocks, uid, gid, file_type, atime_timestamp, path = groups
 
         # Extract and convert values
-        size = int(size_match.group(1))
-        blocks = int(blocks_match.group(1))
-        allocated = blocks * 512  # Convert blocks to bytes
-        uid = int(user_match.group(1))
-        gid = int(group_match.group(1))
-        is_dir = type_match.group(1) == "d"
-        atime_timestamp = int(atime_match.group(1))
-        atime = datetime.fromtimestamp(atime_timestamp)  # Timezone-naive for compatibility
+        size = int(size)
+        allocated = int(blocks) * 512  # Convert blocks to bytes
+        uid = int(uid)
+        gid = int(gid)
+        is_dir = file_type == "d"
+        atime = datetime.fromtimestamp(int(atime_timestamp))  # Timezone-naive for compatibility
 
         return ParsedEntry(
             path=path,
@@ -345,7 +345,7 @@ def compute_access_history(
             conditions.append(_anc_predicate(resolved, params, alias="s"))
         else:
             cte_clause, join_clause = _recursive_descendants_cte(
-                [rid for rid, _ in resolved], params
+                [rid for rid, _ in resolved], params, max_depth=max_depth
             )
 
     where_clause = " AND ".join(conditions) if conditions else "1=1"
@@ -151,35 +151,47 @@ def print_results(
 
 def write_tsv(directories: list[dict], output_path: Path, include_dir_counts: bool = False) -> None:
     """Write results to TSV file."""
+    header = [
+        "directory", "depth",
+        "total_size_r", "total_size_nr",
+        "file_count_r", "file_count_nr",
+    ]
+    if include_dir_counts:
+        header += ["dir_count_r", "dir_count_nr"]
+    header += ["max_atime_r", "max_atime_nr", "owner_uid"]
+
+    # Resolve the dir-count branch once rather than per row; each row is a
+    # single flat tuple rather than a list grown by concatenation.
+    if include_dir_counts:
+        def _rows():
+            for d in directories:
+                yield (
+                    d["path"], d["depth"],
+                    d["total_size_r"], d["total_size_nr"],
+                    d["file_count_r"], d["file_count_nr"],
+                    d.get("ndirs_r", 0), d.get("ndirs_nr", 0),
+                    format_datetime(d["max_atime_r"]),
+                    format_datetime(d["max_atime_nr"]),
+                    d["owner_uid"],
+                )
+    else:
+        def _rows():
+            for d in directories:
+                yield (
+                    d["path"], d["depth"],
+                    d["total_size_r"], d["total_size_nr"],
+                    d["file_count_r"], d["file_count_nr"],
+                    format_datetime(d["max_atime_r"]),
+                    format_datetime(d["max_atime_nr"]),
+                    d["owner_uid"],
+                )
+
+    # str.join does the field joining in C. Fields go through str() exactly
+    # as the f-string writer did: a multi-owner directory's owner_uid stays
+    # "None" and paths are written verbatim, never CSV-quoted.
     with open(output_path, "w") as f:
-        # Header
-        header = (
-            "directory\tdepth\t"
-            "total_size_r\ttotal_size_nr\t"
-            "file_count_r\tfile_count_nr\t"
-        )
-        if include_dir_counts:
-            header += "dir_count_r\tdir_count_nr\t"
-        header += (
-            "max_atime_r\tmax_atime_nr\t"
-            "owner_uid\n"
-        )
-        f.write(header)
-
-        for d in directories:
-            line = (
-                f"{d['path']}\t{d['depth']}\t"
-                f"{d['total_size_r']}\t{d['total_size_nr']}\t"
-                f"{d['file_count_r']}\t{d['file_count_nr']}\t"
-            )
-            if include_dir_counts:
-                line += f"{d.get('ndirs_r', 0)}\t{d.get('ndirs_nr', 0)}\t"
-            line += (
-                f"{format_datetime(d['max_atime_r'])}\t"
-                f"{format_datetime(d['max_atime_nr'])}\t"
-                f"{d['owner_uid']}\n"
-            )
-            f.write(line)
+        f.write("\t".join(header) + "\n")
+        f.writelines("\t".join(map(str, row)) + "\n" for row in _rows())
 
     console.print(f"[green]Results written to {output_path}[/green]")
 
@@ -22,9 +22,12 @@ multi-*filesystem* by default, unlike ``job_history`` which threads a single
 session), so callers never manage session lifecycle.
 """
 
+import heapq
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 
 from ..core.database import get_session, set_data_dir
 from ..core.models import ATIME_BUCKETS, SIZE_BUCKETS
@@ -54,18 +57,20 @@ from .query_engine import (
 # Sort keys for the combined multi-filesystem directory listing. Mirrors the
 # logic that previously lived in fs_scans/cli/query_cmd.py.
 _DIR_SORT_KEYS = {
-    "size": lambda d: d["total_size_r"] or 0,
-    "size_r": lambda d: d["total_size_r"] or 0,
-    "size_nr": lambda d: d["total_size_nr"] or 0,
-    "files": lambda d: d["file_count_r"] or 0,
-    "files_r": lambda d: d["file_count_r"] or 0,
-    "files_nr": lambda d: d["file_count_nr"] or 0,
-    "dirs": lambda d: d["dir_count_r"] or 0,
-    "dirs_r": lambda d: d["dir_count_r"] or 0,
-    "dirs_nr": lambda d: d["dir_count_nr"] or 0,
+    # query_directories already coalesces the size/count columns to 0, so
+    # these are plain C-level itemgetters; only atime can still be NULL.
+    "size": itemgetter("total_size_r"),
+    "size_r": itemgetter("total_size_r"),
+    "size_nr": itemgetter("total_size_nr"),
+    "files": itemgetter("file_count_r"),
+    "files_r": itemgetter("file_count_r"),
+    "files_nr": itemgetter("file_count_nr"),
+    "dirs": itemgetter("dir_count_r"),
+    "dirs_r": itemgetter("dir_count_r"),
+    "dirs_nr": itemgetter("dir_count_nr"),
     "atime_r": lambda d: d["max_atime_r"] or "",
-    "path": lambda d: (d["depth"], d["path"]),
-    "depth": lambda d: d["depth"],
+    "path": itemgetter("depth", "path"),
+    "depth": itemgetter("depth"),
 }
 
 # Entity-summary sort fields accepted by owner_summary/group_summary.
@@ -310,7 +315,10 @@ class FsScanQueries:
         """
         scope = self._resolve_scope(path_prefixes)
         filesystems = list(scope)
-        norm_excludes = [normalize_path(p) for p in exclude_paths] if exclude_paths else None
+        # Normalize the sequence arguments once, as tuples shared read-only by
+        # the inline and fan-out branches (every worker gets the same object).
+        norm_excludes = tuple(normalize_path(p) for p in exclude_paths) if exclude_paths else None
+        name_patterns = tuple(name_patterns) if name_patterns else None
         query_limit = limit if (limit is not None and limit > 0) else None
 
         if len(filesystems) <= 1:
@@ -334,7 +342,7 @@ class FsScanQueries:
                     accessed_after=accessed_after,
                     atime_recursive=atime_recursive,
                     leaves_only=leaves_only,
-                    name_patterns=list(name_patterns) if name_patterns else None,
+                    name_patterns=name_patterns,
                     name_pattern_ignorecase=name_pattern_ignorecase,
                     min_size=min_size,
                     max_size=max_size,
@@ -349,7 +357,7 @@ class FsScanQueries:
 
         # Multi-filesystem: parallel fan-out (each with ITS OWN scope), then
         # combine + re-sort + re-limit.
-        all_directories: list[dict] = []
+        per_fs_results: list[list[dict]] = []
         max_workers = min(len(filesystems), 8)
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {
@@ -367,7 +375,7 @@ class FsScanQueries:
                     accessed_before,
                     accessed_after,
                     leaves_only,
-                    list(name_patterns) if name_patterns else None,
+                    name_patterns,
                     name_pattern_ignorecase,
                     min_size,
                     max_size,
@@ -383,16 +391,23 @@ class FsScanQueries:
                 for fs in filesystems
             }
             for future in as_completed(futures):
-                all_directories.extend(future.result())
-
+                per_fs_results.append(future.result())
+
+        # Each filesystem returns its rows already ordered by the same field,
+        # so k-way merge the runs and stop after ``limit`` rows instead of
+        # sorting the concatenation. The per-run sort is a linear Timsort pass
+        # on already-ordered input; it guards the few places where SQL order
+        # and the Python key differ (path sorts by name vs full path, and
+        # PostgreSQL puts NULLs first in DESC order).
+        sort_key = _DIR_SORT_KEYS.get(sort_by, _DIR_SORT_KEYS["size_r"])
         reverse = sort_by not in ("path",)
-        all_directories.sort(
-            key=_DIR_SORT_KEYS.get(sort_by, _DIR_SORT_KEYS["size_r"]),
-            reverse=reverse,
-        )
-        if query_limit is not None:
-            all_directories = all_directories[:query_limit]
-        return all_directories
+        runs = [sorted(rows, key=sort_key, reverse=reverse) for rows in per_fs_results if rows]
+        if len(runs) <= 1:
+            # Only one filesystem matched: its sorted run is already within
+            # the limit, so there is nothing to merge.
+            return runs[0] if runs else []
+        merged = heapq.merge(*runs, key=sort_key, reverse=reverse)
+        return list(islice(merged, query_limit))
 
     # ------------------------------------------------------------------
     # Owner / group summaries
@@ -437,8 +452,7 @@ class FsScanQueries:
 
         # Query each filesystem with ITS OWN scope (None -> pre-computed
         # OwnerSummary/GroupSummary fast path; sub-paths -> dynamic).
-        all_results: list[dict] = []
-        for fs in filesystems:
+        def _query_one(fs: str) -> list[dict]:
             session = get_session(fs, database=self.database)
             try:
                 results = query_func(
@@ -453,7 +467,19 @@ class FsScanQueries:
                 session.close()
             for result in results:
                 result["filesystem"] = fs
-            all_results.extend(results)
+            return results
+
+        # Sub-path summaries are dynamic aggregations over each collection's
+        # own database, so fan out like list_directories. map() keeps the
+        # filesystem order, so ties in the merged sort stay deterministic.
+        all_results: list[dict] = []
+        if len(filesystems) <= 1:
+            for fs in filesystems:
+                all_results.extend(_query_one(fs))
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(filesystems), 8)) as executor:
+                for results in executor.map(_query_one, filesystems):
+                    all_results.extend(results)
 
         if len(filesystems) <= 1:
             return all_results
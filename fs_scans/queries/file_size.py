@@ -146,7 +146,7 @@ def compute_size_histogram_from_directory_stats(
             conditions.append(_anc_predicate(resolved, params, alias="s"))
         else:
             cte_clause, join_clause = _recursive_descendants_cte(
-                [rid for rid, _ in resolved], params
+                [rid for rid, _ in resolved], params, max_depth=max_depth
             )
 
     where_clause = " AND ".join(conditions) if conditions else "1=1"
@@ -7,13 +7,13 @@ Separated from CLI concerns for modularity and testability.
 import grp
 import os
 import pwd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
 
 from sqlalchemy import inspect, text
 
-from ..core.database import get_data_dir, get_db_path, get_session
+from ..core.database import get_db_path, get_session
 from ..core.models import SCOPE_INDEX_MIN_DEPTH, SCOPE_INDEX_MAX_DEPTH
 from ..core.query_builder import DirectoryQueryBuilder
 
@@ -26,6 +26,30 @@ _MOUNT_POINT_PREFIXES = [
     "/lustre/desc1",
 ]
 
+# Fixed statements, built once at import rather than re-wrapped in text() on
+# every call (dynamic SQL - bind lists, anc_d{k} levels - is still built per
+# call).
+_Q_LATEST_SCAN_DATE = text(
+    "SELECT scan_timestamp FROM scan_metadata ORDER BY scan_id DESC LIMIT 1"
+)
+_Q_ROOT_DEPTH = text("SELECT MIN(depth) FROM directories")
+_Q_COUNT_DIRECTORIES = text("SELECT COUNT(*) FROM directories")
+_Q_ROOT_SUMMARY = text("""
+    SELECT
+        COUNT(*) as dir_count,
+        SUM(file_count_r) as total_files,
+        MAX(total_size_r) as max_size,
+        MAX(depth) as max_depth
+    FROM directories d
+    JOIN directory_stats s USING (dir_id)
+    WHERE d.parent_id IS NULL
+""")
+_Q_COUNT_OWNER_SUMMARY = text("SELECT COUNT(*) FROM owner_summary")
+_Q_COUNT_GROUP_SUMMARY = text("SELECT COUNT(*) FROM group_summary")
+
+# Rows per cursor fetch when streaming directory listings.
+_LISTING_FETCH_BATCH = 10_000
+
 
 def normalize_path(path: str) -> str:
     """Strip known mount point prefixes from a path.
@@ -99,14 +123,12 @@ def get_all_filesystems(database: str | None = None) -> list[str]:
         List of filesystem/collection names (e.g., ['asp', 'cisl', 'cgd'])
     """
     from ..core.config import FsScanConfig
-    from ..core.database import list_pg_schemas
+    from ..core.database import list_pg_schemas, list_sqlite_dbs
 
     if FsScanConfig.DB_BACKEND == "postgres":
         return list_pg_schemas(database=database)
 
-    data_dir = get_data_dir()
-    db_files = data_dir.glob("*.db")
-    return sorted([f.stem for f in db_files])
+    return sorted(list_sqlite_dbs())
 
 
 def get_scan_date(session) -> datetime | None:
@@ -115,9 +137,7 @@ def get_scan_date(session) -> datetime | None:
     Returns:
         The scan_timestamp from the most recent scan metadata entry, or None if not found.
     """
-    result = session.execute(
-        text("SELECT scan_timestamp FROM scan_metadata ORDER BY scan_id DESC LIMIT 1")
-    ).fetchone()
+    result = session.execute(_Q_LATEST_SCAN_DATE).fetchone()
     if not result or not result[0]:
         return None
     # Handle both datetime objects and string formats
@@ -131,13 +151,64 @@ def get_scan_date(session) -> datetime | None:
         return None
 
 
+def _resolve_paths(session, paths: list[str]) -> list[tuple[int, int] | None]:
+    """Resolve full paths to ``(dir_id, stored_depth)`` in a single query.
+
+    Each path becomes one dynamic N-way join (walking every component in one
+    statement instead of one query per component); the per-path joins are
+    combined with ``UNION ALL`` and tagged with their position, so resolving a
+    whole list of scope prefixes costs one database round-trip. Each join is a
+    probe of the ``(parent_id, name)`` unique index, so a walk is O(depth)
+    index seeks — the same cost a materialized ``path`` column lookup would
+    have, without denormalizing every path into the table.
+
+    Returns one entry per input path, ``None`` where the path is empty or not
+    found.
+    """
+    params: dict = {}
+    selects = []
+    for k, path in enumerate(paths):
+        # Normalize path - remove trailing slash, split into components
+        components = [p for p in path.rstrip("/").split("/") if p]
+        if not components:
+            continue
+
+        # SELECT k, dN.dir_id, dN.depth FROM directories d1
+        # JOIN directories d2 ON d2.parent_id = d1.dir_id AND d2.name = :p{k}_c2
+        # ...
+        # WHERE d1.parent_id IS NULL AND d1.name = :p{k}_c1
+        n = len(components)
+        for i, comp in enumerate(components, start=1):
+            params[f"p{k}_c{i}"] = comp
+        joins = [
+            f"JOIN directories d{i} ON d{i}.parent_id = d{i-1}.dir_id"
+            f" AND d{i}.name = :p{k}_c{i}"
+            for i in range(2, n + 1)
+        ]
+        selects.append(
+            f"SELECT {k} AS idx, d{n}.dir_id, d{n}.depth FROM directories d1 "
+            f"{' '.join(joins)} "
+            f"WHERE d1.parent_id IS NULL AND d1.name = :p{k}_c1"
+        )
+
+    resolved: list[tuple[int, int] | None] = [None] * len(paths)
+    if not selects:
+        return resolved
+    query = "\nUNION ALL\n".join(selects)
+    for idx, dir_id, depth in session.execute(text(query), params):
+        resolved[idx] = (dir_id, depth)
+    return resolved
+
+
+def _resolve_path(session, path: str) -> tuple[int, int] | None:
+    """Resolve a single full path to ``(dir_id, stored_depth)``."""
+    return _resolve_paths(session, [path])[0]
+
+
 def resolve_path_to_id(session, path: str) -> int | None:
     """
     Resolve a full path to its dir_id in a single query.
 
-    Uses dynamic N-way joins to walk the entire path in one database round-trip
-    instead of N sequential queries (one per path component).
-
     Args:
         session: SQLAlchemy session
         path: Full path like /gpfs/csfs1/asp/username
@@ -145,46 +216,8 @@ def resolve_path_to_id(session, path: str) -> int | None:
     Returns:
         dir_id or None if not found
     """
-    # Normalize path - remove trailing slash, handle leading slash
-    path = path.rstrip("/")
-    if not path:
-        return None
-
-    # Split path into components
-    components = [p for p in path.split("/") if p]
-    if not components:
-        return None
-
-    # Build single query with N-way joins (1 round-trip instead of N)
-    # SELECT dN.dir_id FROM directories d1
-    # JOIN directories d2 ON d2.parent_id = d1.dir_id AND d2.name = :c2
-    # ...
-    # WHERE d1.parent_id IS NULL AND d1.name = :c1
-    n = len(components)
-    params = {f"c{i+1}": comp for i, comp in enumerate(components)}
-
-    if n == 1:
-        # Single component - simple query
-        query = """
-            SELECT dir_id FROM directories
-            WHERE parent_id IS NULL AND name = :c1
-        """
-    else:
-        # Build N-way join query
-        joins = []
-        for i in range(2, n + 1):
-            joins.append(
-                f"JOIN directories d{i} ON d{i}.parent_id = d{i-1}.dir_id AND d{i}.name = :c{i}"
-            )
-
-        query = f"""
-            SELECT d{n}.dir_id FROM directories d1
-            {' '.join(joins)}
-            WHERE d1.parent_id IS NULL AND d1.name = :c1
-        """
-
-    result = session.execute(text(query), params).fetchone()
-    return result[0] if result else None
+    pair = _resolve_path(session, path)
+    return pair[0] if pair else None
 
 
 def resolve_path_to_id_with_depth(session, path: str) -> tuple[int, int] | None:
@@ -195,16 +228,12 @@ def resolve_path_to_id_with_depth(session, path: str) -> tuple[int, int] | None:
     ``/gpfs/csfs1`` etc.) while per-collection databases store the depth measured
     from the true filesystem root (e.g. ``asp`` is depth 3), so the two differ.
     The stored depth is what indexes the anc_d{k} columns, so it must be exact.
+    Read in the same statement as the path walk (one round-trip).
     """
-    dir_id = resolve_path_to_id(session, path)
-    if dir_id is None:
+    pair = _resolve_path(session, path)
+    if pair is None or pair[1] is None:
         return None
-    depth = session.execute(
-        text("SELECT depth FROM directories WHERE dir_id = :id"), {"id": dir_id}
-    ).scalar()
-    if depth is None:
-        return None
-    return dir_id, depth
+    return pair
 
 
 # Cache of "does directory_stats carry the anc_d* scope columns?" keyed by
@@ -226,9 +255,7 @@ def collection_root_depth(session) -> int | None:
     bind = session.get_bind()
     key = id(bind)
     if key not in _ROOT_DEPTH_CACHE:
-        _ROOT_DEPTH_CACHE[key] = session.execute(
-            text("SELECT MIN(depth) FROM directories")
-        ).scalar()
+        _ROOT_DEPTH_CACHE[key] = session.execute(_Q_ROOT_DEPTH).scalar()
     return _ROOT_DEPTH_CACHE[key]
 
 
@@ -297,11 +324,7 @@ def resolve_scope(session, path_prefixes: list[str]):
     drops any nested under another), so the per-level predicates OR together
     without double-counting.
     """
-    raw = []
-    for prefix in path_prefixes:
-        pair = resolve_path_to_id_with_depth(session, prefix)
-        if pair is not None:
-            raw.append(pair)
+    raw = [pair for pair in _resolve_paths(session, list(path_prefixes)) if pair is not None]
     if not raw:
         return None, False
 
@@ -317,16 +340,24 @@ def resolve_scope(session, path_prefixes: list[str]):
     return resolved, use_fast
 
 
-def _recursive_descendants_cte(ancestor_ids: list[int], params: dict) -> tuple[str, str]:
+def _recursive_descendants_cte(
+    ancestor_ids: list[int], params: dict, max_depth: int | None = None
+) -> tuple[str, str]:
     """Build the recursive-subtree CTE + join clause for *ancestor_ids*.
 
     Mutates *params* with ``ancestor_id_{i}`` binds. Returns
     ``(cte_clause, join_clause)`` — the historical fallback shared by every
-    scoped consumer.
+    scoped consumer. With *max_depth* the walk stops descending at that depth
+    (binds ``max_depth``): rows below it are filtered out by the caller's depth
+    predicate anyway, so expanding them only costs index probes.
     """
     for i, aid in enumerate(ancestor_ids):
         params[f"ancestor_id_{i}"] = aid
     ancestor_params = ", ".join(f":ancestor_id_{i}" for i in range(len(ancestor_ids)))
+    depth_bound = ""
+    if max_depth is not None:
+        params["max_depth"] = max_depth
+        depth_bound = "\n            WHERE d.depth <= :max_depth"
     cte_clause = f"""
         WITH RECURSIVE
         ancestors AS (
@@ -336,7 +367,7 @@ def _recursive_descendants_cte(ancestor_ids: list[int], params: dict) -> tuple[s
             SELECT dir_id FROM ancestors
             UNION ALL
             SELECT d.dir_id FROM directories d
-            JOIN descendants p ON d.parent_id = p.dir_id
+            JOIN descendants p ON d.parent_id = p.dir_id{depth_bound}
         )
     """
     return cte_clause, "JOIN descendants USING (dir_id)"
@@ -368,24 +399,7 @@ def get_full_path(session, dir_id: int) -> str:
     Returns:
         Full path string
     """
-    result = session.execute(
-        text("""
-            WITH RECURSIVE path_cte AS (
-                SELECT dir_id, parent_id, name, name as full_path
-                FROM directories WHERE dir_id = :dir_id
-                UNION ALL
-                SELECT p.dir_id, p.parent_id, p.name, p.name || '/' || c.full_path
-                FROM directories p
-                JOIN path_cte c ON c.parent_id = p.dir_id
-            )
-            SELECT full_path FROM path_cte WHERE parent_id IS NULL
-        """),
-        {"dir_id": dir_id},
-    ).fetchone()
-
-    if result:
-        return "/" + result[0]
-    return f"<unknown:{dir_id}>"
+    return get_full_paths_batch(session, [dir_id]).get(dir_id, f"<unknown:{dir_id}>")
 
 
 def get_full_paths_batch(session, dir_ids: list[int]) -> dict[int, str]:
@@ -470,14 +484,14 @@ def query_directories(
     owner_id: int | None = None,
     group_id: int | None = None,
     path_prefixes: list[str] | None = None,
-    exclude_paths: list[str] | None = None,
+    exclude_paths: Sequence[str] | None = None,
     sort_by: str = "size_r",
     limit: int | None = None,
     accessed_before: datetime | None = None,
     accessed_after: datetime | None = None,
     atime_recursive: bool = True,
     leaves_only: bool = False,
-    name_patterns: list[str] | None = None,
+    name_patterns: Sequence[str] | None = None,
     name_pattern_ignorecase: bool = False,
     min_size: int | None = None,
     max_size: int | None = None,
@@ -529,6 +543,15 @@ def query_directories(
         if scope_resolved is None:
             return []  # No valid paths found
 
+    # Resolve exclude_paths the same way; paths that don't exist in this
+    # database simply exclude nothing.
+    exclude_resolved = None
+    exclude_use_fast = False
+    if exclude_paths:
+        exclude_resolved, exclude_use_fast = resolve_scope(
+            session, [p.rstrip("/") for p in exclude_paths]
+        )
+
     # Phase 2: Build query using DirectoryQueryBuilder (dialect-aware so name
     # pattern matching uses GLOB on sqlite and regex `~`/ILIKE on postgresql).
     builder = DirectoryQueryBuilder(dialect=session.get_bind().dialect.name)
@@ -557,7 +580,7 @@ def query_directories(
 
     # Apply name pattern filters
     if name_patterns:
-        builder.with_name_patterns(list(name_patterns), name_pattern_ignorecase)
+        builder.with_name_patterns(name_patterns, name_pattern_ignorecase)
 
     # Apply size and file count filters
     if min_size is not None or max_size is not None:
@@ -573,85 +596,78 @@ def query_directories(
         if scope_use_fast:
             builder.with_path_prefix_anc(scope_resolved)
         else:
-            builder.with_path_prefix_ids([rid for rid, _ in scope_resolved])
+            builder.with_path_prefix_ids(
+                [rid for rid, _ in scope_resolved], max_depth=max_depth
+            )
+
+    # Apply exclusions in SQL (anti-join) so excluded subtrees never reach
+    # ORDER BY / LIMIT — a Python post-filter would both fetch rows only to
+    # drop them and return fewer than `limit` rows.
+    if exclude_resolved:
+        if exclude_use_fast:
+            builder.with_exclude_anc(exclude_resolved)
+        else:
+            builder.with_exclude_ids(
+                [rid for rid, _ in exclude_resolved], max_depth=max_depth
+            )
 
     # Apply sorting and limit
     builder.with_sort(sort_by)
     if limit is not None:
         builder.with_limit(limit)
 
-    # Phase 3: Execute query
-    query_result = builder.build()
-    results = session.execute(text(query_result.sql), query_result.params).fetchall()
-
-    # Batch fetch all full paths in single query (N queries -> 1)
-    dir_ids = [row[0] for row in results]
-    path_map = get_full_paths_batch(session, dir_ids)
+    # Resolve full paths in the same statement (one round-trip, walking up
+    # from the result page only).
+    builder.with_full_paths()
 
-    # Normalize exclude paths for prefix matching
-    normalized_excludes = None
-    if exclude_paths:
-        normalized_excludes = [p.rstrip("/") for p in exclude_paths]
+    # Phase 3: Execute query. Rows are consumed straight off the cursor in
+    # yield_per-sized batches (a server-side cursor on PostgreSQL) rather
+    # than fetchall()'d, so an unlimited listing never holds the raw rows and
+    # the result dicts in memory at the same time.
+    query_result = builder.build()
+    results = session.execute(
+        text(query_result.sql),
+        query_result.params,
+        execution_options={"yield_per": _LISTING_FETCH_BATCH},
+    )
 
-    # Convert to dictionaries with full paths
+    # Convert to dictionaries with full paths. Unpacking the row tuple once
+    # is cheaper than fourteen indexed lookups per row on large listings.
     directories = []
-    for row in results:
-        dir_id = row[0]
-        path = path_map.get(dir_id, f"<unknown:{dir_id}>")
-
-        # Filter out excluded paths (path prefix matching)
-        if normalized_excludes:
-            excluded = False
-            for excl in normalized_excludes:
-                if path == excl or path.startswith(excl + "/"):
-                    excluded = True
-                    break
-            if excluded:
-                continue
-
-        directories.append({
+    for (
+        dir_id, _parent_id, _name, depth,
+        file_count_nr, total_size_nr, max_atime_nr, dir_count_nr,
+        file_count_r, total_size_r, max_atime_r, dir_count_r,
+        owner_uid, owner_gid, full_path,
+    ) in results:
+        d = {
             "dir_id": dir_id,
-            "path": path,
-            "depth": row[3],
-            "file_count_nr": row[4] or 0,
-            "total_size_nr": row[5] or 0,
-            "max_atime_nr": row[6],
-            "dir_count_nr": row[7] or 0,
-            "file_count_r": row[8] or 0,
-            "total_size_r": row[9] or 0,
-            "max_atime_r": row[10],
-            "dir_count_r": row[11] or 0,
-            "owner_uid": row[12],
-            "owner_gid": row[13],
-        })
-
-    # Optionally add directory counts for backward compatibility
-    # (now they're always available, but we add separate keys if requested)
-    if compute_dir_counts and directories:
-        for d in directories:
+            "path": full_path or f"<unknown:{dir_id}>",
+            "depth": depth,
+            "file_count_nr": file_count_nr or 0,
+            "total_size_nr": total_size_nr or 0,
+            "max_atime_nr": max_atime_nr,
+            "dir_count_nr": dir_count_nr or 0,
+            "file_count_r": file_count_r or 0,
+            "total_size_r": total_size_r or 0,
+            "max_atime_r": max_atime_r,
+            "dir_count_r": dir_count_r or 0,
+            "owner_uid": owner_uid,
+            "owner_gid": owner_gid,
+        }
+        # Separate directory-count keys for backward compatibility (the
+        # counts are always available now, but callers may ask for these).
+        if compute_dir_counts:
             d["ndirs_r"] = d["dir_count_r"]
             d["ndirs_nr"] = d["dir_count_nr"]
+        directories.append(d)
 
     return directories
 
 def get_summary(session) -> dict:
     """Get summary statistics from the database."""
-    result = session.execute(
-        text("""
-            SELECT
-                COUNT(*) as dir_count,
-                SUM(file_count_r) as total_files,
-                MAX(total_size_r) as max_size,
-                MAX(depth) as max_depth
-            FROM directories d
-            JOIN directory_stats s USING (dir_id)
-            WHERE d.parent_id IS NULL
-        """)
-    ).fetchone()
-
-    total_dirs = session.execute(
-        text("SELECT COUNT(*) FROM directories")
-    ).fetchone()[0]
+    result = session.execute(_Q_ROOT_SUMMARY).fetchone()
+    total_dirs = session.execute(_Q_COUNT_DIRECTORIES).fetchone()[0]
 
     return {
         "total_directories": total_dirs,
@@ -693,9 +709,7 @@ def query_owner_summary(
         # Fast path: use pre-computed OwnerSummary table
         # Check if the table exists and has data
         try:
-            count = session.execute(
-                text("SELECT COUNT(*) FROM owner_summary")
-            ).scalar()
+            count = session.execute(_Q_COUNT_OWNER_SUMMARY).scalar()
         except Exception:
             count = 0
 
@@ -750,7 +764,7 @@ def query_owner_summary(
             conditions.append(_anc_predicate(resolved, params, alias="s"))
         else:
             cte_clause, join_clause = _recursive_descendants_cte(
-                [rid for rid, _ in resolved], params
+                [rid for rid, _ in resolved], params, max_depth=max_depth
             )
 
     sort_map = {
@@ -1099,9 +1113,7 @@ def query_group_summary(
         # Fast path: use pre-computed GroupSummary table
         # Check if the table exists and has data
         try:
-            count = session.execute(
-                text("SELECT COUNT(*) FROM group_summary")
-            ).scalar()
+            count = session.execute(_Q_COUNT_GROUP_SUMMARY).scalar()
         except Exception:
             count = 0
 
@@ -1156,7 +1168,7 @@ def query_group_summary(
             conditions.append(_anc_predicate(resolved, params, alias="s"))
         else:
             cte_clause, join_clause = _recursive_descendants_cte(
-                [rid for rid, _ in resolved], params
+                [rid for rid, _ in resolved], params, max_depth=max_depth
             )
 
     sort_map = {
@@ -1212,13 +1224,13 @@ def query_single_filesystem(
     single_owner: bool,
     owner_id: int | None,
     path_prefixes: list[str] | None,
-    exclude_paths: list[str] | None,
+    exclude_paths: Sequence[str] | None,
     sort_by: str,
     limit: int | None,
     accessed_before: datetime | None,
     accessed_after: datetime | None,
     leaves_only: bool,
-    name_patterns: list[str] | None,
+    name_patterns: Sequence[str] | None,
     name_pattern_ignorecase: bool,
     min_size: int | None = None,
     max_size: int | None = None,
@@ -1233,8 +1245,12 @@ def query_single_filesystem(
 ) -> list[dict]:
     """Query a single filesystem database.
 
-    Designed for parallel execution with ThreadPoolExecutor.
-    Creates and closes its own session.
+    Designed for parallel execution with ThreadPoolExecutor (see
+    ``FsScanQueries.list_directories``). Creates and closes its own session.
+    Threads, not subinterpreters or processes: the sqlite3 driver releases the
+    GIL while stepping the statement, which is where a filtered scan spends its
+    time, and neither SQLAlchemy's compiled extensions nor psycopg2 can be
+    imported into an isolated-GIL subinterpreter.
 
     Args:
         filesystem: Filesystem name to query
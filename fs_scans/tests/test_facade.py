@@ -40,7 +40,8 @@ from fs_scans.cli.core import (
     build_group_summary,
     build_owner_summary,
 )
-from fs_scans.cli.core.output import ExporterRegistry, RichExporter
+from fs_scans.cli.core.output import ExporterRegistry, RichExporter, TSVFileExporter
+from fs_scans.queries.display import write_tsv
 
 SCAN_DATE = datetime(2026, 1, 15)
 
@@ -574,6 +575,75 @@ def test_access_history_mixed_root_and_subpath(mixed_collections):
     assert bob_files == 200
 
 
+def test_owner_summary_fans_out_across_collections(mixed_collections):
+    """Per-collection summaries run concurrently; each keeps its own scope."""
+    q = FsScanQueries(filesystems=mixed_collections)
+    rows = q.owner_summary(path_prefixes=["/alpha", "/beta/sub"], breakdown=True)
+
+    # alpha has no owner_summary rows; beta counts only /beta/sub.
+    assert [(r["owner_uid"], r["filesystem"], r["total_size"]) for r in rows] == [
+        (1002, "beta", 2_000),
+    ]
+
+
+def test_list_directories_multi_collection_top_k(mixed_collections):
+    """The cross-collection merge keeps the global top-``limit`` in order."""
+    q = FsScanQueries(filesystems=mixed_collections)
+    rows = q.list_directories(limit=2)
+    assert [r["path"] for r in rows] == ["/beta/other", "/beta/sub"]
+
+    rows = q.list_directories(sort_by="path", limit=2)
+    assert [r["path"] for r in rows] == ["/beta", "/beta/other"]
+
+
+def test_list_directories_merge_matches_sort_then_slice(mixed_collections, monkeypatch):
+    """The k-way merge returns exactly the sort-then-slice result, including
+    runs whose SQL order differs from the Python key (NULL-first on PG)."""
+    import fs_scans.queries.facade as facade
+
+    def row(path, size):
+        return {"path": path, "depth": path.count("/"), "total_size_r": size}
+
+    runs = {
+        "alpha": [row("/alpha/a", 0), row("/alpha/b", 50), row("/alpha/c", 10)],
+        "beta": [row("/beta/a", 40), row("/beta/b", 40), row("/beta/c", 5)],
+    }
+    monkeypatch.setattr(facade, "query_single_filesystem",
+                        lambda fs, *args, **kwargs: list(runs[fs]))
+
+    q = FsScanQueries(filesystems=mixed_collections)
+    everything = sorted(runs["alpha"] + runs["beta"],
+                        key=lambda d: d["total_size_r"], reverse=True)
+    for limit in (0, 1, 3, 10):
+        got = q.list_directories(limit=limit)
+        want = everything[:limit] if limit else everything
+        assert [d["total_size_r"] for d in got] == [d["total_size_r"] for d in want]
+
+
+def test_list_directories_single_run_uses_merge_order(mixed_collections, monkeypatch):
+    """With one non-empty run, path order is still by full path (as in the
+    merge), not the SQL (depth, name) order the run arrives in."""
+    import fs_scans.queries.facade as facade
+
+    def row(path):
+        return {"path": path, "depth": path.count("/"), "total_size_r": 0}
+
+    # SQL order for sort_by="path": depth, then name ("a" < "z").
+    runs = {"alpha": [row("/b/a"), row("/a/z")], "beta": []}
+    monkeypatch.setattr(facade, "query_single_filesystem",
+                        lambda fs, *args, **kwargs: list(runs[fs]))
+
+    q = FsScanQueries(filesystems=mixed_collections)
+    assert [r["path"] for r in q.list_directories(sort_by="path", limit=0)] == [
+        "/a/z", "/b/a",
+    ]
+
+    runs["beta"] = [row("/c/c")]
+    assert [r["path"] for r in q.list_directories(sort_by="path", limit=0)] == [
+        "/a/z", "/b/a", "/c/c",
+    ]
+
+
 def test_list_directories_overlapping_prefixes_no_duplicates(collection):
     # Overlapping prefixes used to yield duplicate rows (one per matching
     # ancestor); _collapse_prefixes removes the redundancy.
@@ -696,6 +766,57 @@ def test_facade_resolve_usernames_across_collections(two_collections):
     assert names == {_REMOTE_UID: "claire"}
 
 
+def test_tsv_exporter_writes_directory_rows(collection, tmp_path):
+    q = FsScanQueries(filesystems="testfs")
+    rows = q.list_directories(min_depth=2, limit=0, compute_dir_counts=True)
+    out = tmp_path / "dirs.tsv"
+    TSVFileExporter(out).emit(
+        build_directories(rows, filesystems=["testfs"], show_dir_counts=True))
+
+    lines = out.read_text().splitlines()
+    assert lines[0].split("\t") == [
+        "directory", "depth", "total_size_r", "total_size_nr",
+        "file_count_r", "file_count_nr", "dir_count_r", "dir_count_nr",
+        "max_atime_r", "max_atime_nr", "owner_uid",
+    ]
+    assert len(lines) == len(rows) + 1
+    first = lines[1].split("\t")
+    assert first[0] == rows[0]["path"]
+    assert first[2] == str(rows[0]["total_size_r"])
+
+
+def test_write_tsv_matches_plain_text_format(tmp_path):
+    """Nullable fields print as ``None`` and paths are written verbatim
+    (no CSV quoting), byte-for-byte as the original f-string writer did."""
+    rows = [
+        {"path": '/gpfs/a "quoted" dir', "depth": 2,
+         "total_size_r": 10, "total_size_nr": 4,
+         "file_count_r": 3, "file_count_nr": 1, "ndirs_r": 2, "ndirs_nr": 1,
+         "max_atime_r": datetime(2025, 3, 4, 5, 6), "max_atime_nr": None,
+         "owner_uid": None},
+        {"path": "/gpfs/b", "depth": 1,
+         "total_size_r": 0, "total_size_nr": 0,
+         "file_count_r": 0, "file_count_nr": 0,
+         "max_atime_r": None, "max_atime_nr": None,
+         "owner_uid": 1000},
+    ]
+    out = tmp_path / "dirs.tsv"
+
+    write_tsv(rows, out)
+    assert out.read_bytes() == (
+        b"directory\tdepth\ttotal_size_r\ttotal_size_nr\tfile_count_r\tfile_count_nr\t"
+        b"max_atime_r\tmax_atime_nr\towner_uid\n"
+        b'/gpfs/a "quoted" dir\t2\t10\t4\t3\t1\t2025-03-04\tN/A\tNone\n'
+        b"/gpfs/b\t1\t0\t0\t0\t0\tN/A\tN/A\t1000\n"
+    )
+
+    write_tsv(rows, out, include_dir_counts=True)
+    assert out.read_bytes().splitlines()[1:] == [
+        b'/gpfs/a "quoted" dir\t2\t10\t4\t3\t1\t2\t1\t2025-03-04\tN/A\tNone',
+        b"/gpfs/b\t1\t0\t0\t0\t0\t0\t0\tN/A\tN/A\t1000",
+    ]
+
+
 def test_rich_exporter_renders_all_kinds(collection):
     """The rich exporter must handle every envelope kind without error."""
     q = FsScanQueries(filesystems="testfs")
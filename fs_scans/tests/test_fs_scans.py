@@ -9,11 +9,14 @@ from sqlalchemy.orm import sessionmaker
 from fs_scans.core.models import Base, Directory, DirectoryStats
 from fs_scans.core.database import get_engine, clear_engine_cache
 from fs_scans.core.query_builder import DirectoryQueryBuilder, QueryResult
-from fs_scans.cli.common import parse_size, parse_file_count
+from fs_scans.cli.common import format_size, parse_size, parse_file_count
 from fs_scans.queries.query_engine import (
     collection_for_path,
+    get_full_path,
     normalize_path,
     query_directories,
+    resolve_path_to_id,
+    resolve_path_to_id_with_depth,
 )
 
 
@@ -119,6 +122,17 @@ class TestEngineCaching:
 
         assert engine1 is not engine2
 
+    def test_sqlite_connections_get_read_pragmas(self, tmp_path, monkeypatch):
+        """New SQLite connections get the larger page cache / mmap settings."""
+        monkeypatch.setenv("FS_SCAN_DATA_DIR", str(tmp_path))
+        clear_engine_cache()
+
+        with get_engine("test").connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -262144
+            assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() != "wal"
+        clear_engine_cache()
+
     def test_postgres_engine_has_pre_ping_and_recycle(self, monkeypatch):
         """Postgres engines must enable pool_pre_ping (and pool_recycle).
 
@@ -352,6 +366,66 @@ class TestDirectoryQueryBuilder:
         assert result.params["ancestor_id_0"] == 42
         assert result.params["ancestor_id_1"] == 99
 
+    def test_exclude_ids_anti_join(self):
+        """Test excluded IDs generate an excluded-subtree CTE + NOT EXISTS."""
+        builder = DirectoryQueryBuilder()
+        result = builder.with_exclude_ids([7, 9]).build()
+
+        assert "WITH RECURSIVE" in result.sql
+        assert "excluded AS" in result.sql
+        assert "NOT EXISTS (SELECT 1 FROM excluded x WHERE x.dir_id = d.dir_id)" in result.sql
+        assert "FROM directories d" in result.sql
+        assert result.params["exclude_id_0"] == 7
+        assert result.params["exclude_id_1"] == 9
+
+    def test_exclude_with_path_prefix_cte(self):
+        """Exclusion CTEs chain onto the descendants CTE in one WITH clause."""
+        builder = DirectoryQueryBuilder()
+        result = builder.with_path_prefix_ids([42]).with_exclude_ids([7]).build()
+
+        assert result.sql.count("WITH RECURSIVE") == 1
+        assert "descendants AS" in result.sql
+        assert "excluded AS" in result.sql
+
+    def test_full_paths_wraps_page_and_walks_up(self):
+        """with_full_paths() limits first, then walks up from the page only."""
+        builder = DirectoryQueryBuilder()
+        result = builder.with_sort("path").with_limit(5).with_full_paths().build()
+
+        assert "page AS (" in result.sql
+        assert "path_cte AS (" in result.sql
+        assert "LIMIT :limit)" in result.sql  # the limit is inside the page
+        assert "AS full_path" in result.sql
+        assert result.sql.rstrip().endswith(
+            "ORDER BY page.depth ASC, page.name ASC, page.dir_id ASC"
+        )
+
+    def test_full_paths_page_order_names_sort_columns(self):
+        """The page re-sort is built from the sort columns, not SQL rewriting."""
+        builder = DirectoryQueryBuilder()
+        result = builder.with_sort("dirs_nr").with_full_paths().build()
+
+        assert "page AS (" in result.sql
+        assert ":limit" not in result.sql
+        assert result.sql.rstrip().endswith(
+            "ORDER BY page.dir_count_nr DESC, page.dir_id ASC"
+        )
+
+    def test_path_prefix_cte_depth_bound(self):
+        """max_depth stops the descendants walk at that depth."""
+        builder = DirectoryQueryBuilder()
+        result = builder.with_path_prefix_ids([42], max_depth=6).build()
+
+        assert "JOIN descendants p ON d.parent_id = p.dir_id\n                WHERE d.depth <= :max_depth" in result.sql
+        assert result.params["max_depth"] == 6
+
+    def test_sort_tiebreak_is_dir_id_ascending(self):
+        """Ties break on ascending dir_id regardless of the sort direction."""
+        sql = DirectoryQueryBuilder().with_sort("size_r").build().sql
+        assert "ORDER BY s.total_size_r DESC, d.dir_id ASC" in sql
+        sql = DirectoryQueryBuilder().with_sort("path").build().sql
+        assert "ORDER BY d.depth ASC, d.name ASC, d.dir_id ASC" in sql
+
     def test_sort_options(self):
         """Test various sort options."""
         test_cases = [
@@ -483,6 +557,28 @@ class TestParseSize:
             parse_size("abc")
 
 
+class TestFormatSize:
+    """Tests for format_size helper."""
+
+    def test_unit_boundaries(self):
+        assert format_size(None) == "N/A"
+        assert format_size(0) == "0.0 B"
+        assert format_size(1023) == "1023.0 B"
+        assert format_size(1024) == "1.0 KiB"
+        assert format_size(1024**2 - 1) == "1024.0 KiB"
+        assert format_size(1024**2) == "1.0 MiB"
+        assert format_size(3 * 1024**5) == "3.0 PiB"
+        assert format_size(1024**6 - 1) == "1.0 EiB"  # float rounds up a unit
+        assert format_size(2 * 1024**7) == "2048.0 EiB"
+        assert format_size(-2048) == "-2.0 KiB"
+
+    def test_non_integer_sizes(self):
+        from decimal import Decimal
+
+        assert format_size(1536.0) == "1.5 KiB"
+        assert format_size(Decimal(1024**3)) == "1.0 GiB"
+
+
 class TestParseFileCount:
     """Tests for parse_file_count helper."""
 
@@ -838,3 +934,96 @@ class TestQueryDirectoriesAvgFileSize:
         self._populate(fs_scan_session)
         rows = query_directories(fs_scan_session)
         assert {r["dir_id"] for r in rows} == {1, 2, 3}
+
+
+class TestQueryDirectoriesExclude:
+    """query_directories(exclude_paths=...) drops excluded subtrees in SQL."""
+
+    def test_excluded_subtree_removed(self, populated_session):
+        rows = query_directories(populated_session, exclude_paths=["/gpfs/csfs1/cisl/userA"])
+
+        assert {r["dir_id"] for r in rows} == {1, 2, 3, 5}
+
+    def test_exclusion_applies_before_limit(self, populated_session):
+        # userA ranks inside the top 4 by size; LIMIT must still fill from the
+        # rows after it rather than returning three.
+        rows = query_directories(
+            populated_session, exclude_paths=["/gpfs/csfs1/cisl/userA/"], limit=4,
+        )
+
+        assert [r["dir_id"] for r in rows] == [1, 2, 3, 5]
+
+    def test_unresolvable_exclude_is_ignored(self, populated_session):
+        rows = query_directories(populated_session, exclude_paths=["/nope"], limit=2)
+
+        assert [r["dir_id"] for r in rows] == [1, 2]
+
+
+class TestQueryDirectoriesFullPaths:
+    """query_directories resolves each row's path in the listing statement."""
+
+    def test_paths_resolved_in_listing(self, populated_session):
+        rows = query_directories(populated_session, sort_by="path", limit=3)
+
+        assert [r["path"] for r in rows] == ["/gpfs", "/gpfs/csfs1", "/gpfs/csfs1/cisl"]
+
+    def test_order_preserved_with_scope(self, populated_session):
+        rows = query_directories(populated_session, path_prefixes=["/gpfs/csfs1/cisl"])
+
+        assert [r["path"] for r in rows] == [
+            "/gpfs/csfs1/cisl",
+            "/gpfs/csfs1/cisl/userA",
+            "/gpfs/csfs1/cisl/userB",
+        ]
+
+
+class TestPathResolution:
+    """Path <-> dir_id helpers: one round-trip each way."""
+
+    def test_resolve_path(self, populated_session):
+        assert resolve_path_to_id(populated_session, "/gpfs") == 1
+        assert resolve_path_to_id(populated_session, "/gpfs/csfs1/cisl/userB/") == 5
+        assert resolve_path_to_id(populated_session, "/gpfs/nope") is None
+        assert resolve_path_to_id(populated_session, "/") is None
+
+    def test_resolve_path_with_stored_depth(self, populated_session):
+        assert resolve_path_to_id_with_depth(populated_session, "/gpfs/csfs1/cisl") == (3, 3)
+        assert resolve_path_to_id_with_depth(populated_session, "/gpfs/nope") is None
+
+    def test_resolve_paths_batch(self, populated_session):
+        """Several prefixes resolve in one UNION ALL statement, in input order."""
+        from fs_scans.queries.query_engine import _resolve_paths
+
+        assert _resolve_paths(populated_session, [
+            "/gpfs/csfs1/cisl/userB", "/gpfs/nope", "/", "/gpfs",
+        ]) == [(5, 4), None, None, (1, 1)]
+        assert _resolve_paths(populated_session, []) == []
+
+    def test_get_full_path(self, populated_session):
+        assert get_full_path(populated_session, 4) == "/gpfs/csfs1/cisl/userA"
+        assert get_full_path(populated_session, 99) == "<unknown:99>"
+
+
+class TestSqliteDiscovery:
+    """SQLite collection discovery + sizing (get_all_filesystems / --show-config)."""
+
+    def test_lists_and_sizes_in_one_scan(self, tmp_path, monkeypatch):
+        """get_all_filesystems/describe_databases share the single scandir pass."""
+        from fs_scans.core import database as db
+        from fs_scans.queries.query_engine import get_all_filesystems
+
+        monkeypatch.setattr(db.FsScanConfig, "DB_BACKEND", "sqlite")
+        monkeypatch.delenv("FS_SCAN_DB", raising=False)
+        (tmp_path / "mmm.db").write_bytes(b"x" * 10)
+        (tmp_path / "cisl.db").write_bytes(b"x" * 3)
+        (tmp_path / "notes.txt").write_text("ignored")
+        db.set_data_dir(tmp_path)
+        try:
+            assert db.list_sqlite_dbs() == {"cisl": 3, "mmm": 10}
+            assert get_all_filesystems() == ["cisl", "mmm"]
+            assert db.describe_databases() == [
+                ("cisl", str(tmp_path / "cisl.db"), 3),
+                ("mmm", str(tmp_path / "mmm.db"), 10),
+            ]
+        finally:
+            db.set_data_dir(None)
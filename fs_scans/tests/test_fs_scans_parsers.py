@@ -85,6 +85,35 @@ class TestGPFSParser:
         assert entry.size == 512
         assert entry.allocated == 512  # Should be set to size for small files
 
+    def test_parse_line_full_policy_record(self):
+        """Test fields are found regardless of order and trailing timestamps."""
+        parser = GPFSParser()
+        line = (
+            "<3> 202 1 0 p=-rw-r--r-- nl=1 ac=2024-01-01 10:00:00 "
+            "mt=2023-12-31 09:00:00 u=1000 g=1000 a=1032 s=1048576 m=FAu -- /gpfs/test/old -- x.dat"
+        )
+
+        entry = parser.parse_line(line)
+
+        assert entry is not None
+        assert entry.path == "/gpfs/test/old -- x.dat"
+        assert entry.size == 1048576
+        assert entry.allocated == 1032 * 1024
+        assert entry.atime == datetime(2024, 1, 1, 10, 0, 0)
+
+        # Non-numeric or malformed values are rejected rather than raising
+        assert parser.parse_line(line.replace("u=1000", "u=abc")) is None
+        assert parser.parse_line(line.replace("ac=2024-01-01 10:00:00", "ac=2024-01-01")) is None
+
+    def test_parse_lines_matches_parse_line(self):
+        """Test chunk parsing of raw lines matches per-line parsing."""
+        parser = GPFSParser()
+        data = Path(__file__).parent / "data" / "20260115_test_minimal.list.list_all.log"
+        lines = data.read_text().splitlines(keepends=True)
+
+        expected = [e for e in map(parser.parse_line, (l.rstrip("\n") for l in lines)) if e]
+        assert list(parser.parse_lines(lines)) == expected
+
     def test_parse_line_invalid(self):
         """Test parsing invalid line returns None."""
         parser = GPFSParser()
@@ -94,6 +123,9 @@ class TestGPFSParser:
         assert parser.parse_line("") is None
         assert parser.parse_line("# comment") is None
 
+        # Record prefix but truncated before the "-- path" separator
+        assert parser.parse_line("<0> 123456 1 0 s=4096 a=4 u=1000 g=100") is None
+
     def test_parse_line_missing_required_fields(self):
         """Test parsing line with missing required fields returns None."""
         parser = GPFSParser()
@@ -281,6 +313,21 @@ class TestLustreParser:
         assert entry.allocated == 159249346560  # 311033880 * 512
         assert entry.is_dir is False
 
+    def test_parse_line_fields_out_of_order(self):
+        """Fields in a non-default order still parse via the fallback."""
+        parser = LustreParser()
+        line = "0x28001ff98:0xe66b:0x0 type=f a=1708547123 u=16093 s=51 g=4801 b=8 -- /lustre/a -- b"
+
+        entry = parser.parse_line(line)
+
+        assert entry is not None
+        assert entry.path == "/lustre/a -- b"
+        assert entry.size == 51
+        assert entry.allocated == 4096
+        assert (entry.uid, entry.gid) == (16093, 4801)
+        assert entry.is_dir is False
+        assert entry.atime == datetime.fromtimestamp(1708547123)
+
     def test_parse_line_invalid(self):
         """Test parsing invalid line returns None."""
         parser = LustreParser()
@@ -306,6 +353,10 @@ class TestLustreParser:
         line = "0x28001ff98:0xe66b:0x0 s=51 b=8 u=16093 g=4801 p=1 perm=0755 a=1708547123 -- /file.txt"
         assert parser.parse_line(line) is None
 
+        # Keys only match whole: "ca=" does not supply the missing "a="
+        line = "0x28001ff98:0xe66b:0x0 type=f ca=1708547123 u=16093 s=51 g=4801 b=8 -- /file.txt"
+        assert parser.parse_line(line) is None
+
 
 # ============================================================================
 # Filesystem Name Extraction Tests
@@ -1,6 +1,9 @@
 """Tests for histogram collection during import."""
 
+import pickle
+import sqlite3
 import pytest
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, text
@@ -14,10 +17,24 @@ from fs_scans.core.models import (
     SizeHistogram,
     ATIME_BUCKETS,
     SIZE_BUCKETS,
+    atime_bucket_cutoffs,
     classify_atime_bucket,
     classify_size_bucket,
 )
 from fs_scans.core.database import clear_engine_cache
+from fs_scans.importers.file_handling import (
+    MAX_CHUNK_BYTES,
+    MIN_CHUNK_BYTES,
+    auto_chunk_bytes,
+    chunk_byte_ranges,
+    read_line_chunk,
+)
+from fs_scans.importers.pass1 import (
+    _worker_scan_chunk,
+    merge_dir_stats,
+    merge_histograms,
+    pass1_discover_directories,
+)
 from fs_scans.importers.importer import (
     run_import,
 )
@@ -88,6 +105,18 @@ class TestBucketClassification:
         atime = scan_date - timedelta(days=31)  # 31 days old
         assert classify_atime_bucket(atime, scan_date) == 1
 
+    def test_atime_bucket_cutoffs_match_classify(self):
+        """Bisecting the precomputed cutoffs agrees with classify_atime_bucket,
+        including atimes a second either side of each day boundary."""
+        scan_date = datetime(2026, 1, 15, 8, 30)
+        cutoffs = atime_bucket_cutoffs(scan_date)
+        for days in range(0, 3000, 7):
+            for delta in (timedelta(days=days), timedelta(days=days, seconds=1),
+                          timedelta(days=days, seconds=-1)):
+                atime = scan_date - delta
+                assert (len(cutoffs) - bisect_left(cutoffs, atime)
+                        == classify_atime_bucket(atime, scan_date))
+
     def test_classify_size_bucket_small(self):
         """Test classification of small files."""
         # 512 bytes -> bucket 0 (0 - 1 KiB)
@@ -151,6 +180,95 @@ class TestBucketClassification:
         assert len(buckets_seen) == 10
 
 
+# ============================================================================
+# Input Chunking Tests
+# ============================================================================
+
+
+class TestChunkByteRanges:
+    """Tests for splitting the scan log into per-worker byte ranges."""
+
+    @pytest.mark.parametrize("chunk_bytes", [1, 100, 333, 1 << 20])
+    def test_ranges_cover_every_line_once(self, test_data_file, chunk_bytes):
+        """Reading all ranges reproduces the file's lines in order."""
+        ranges = list(chunk_byte_ranges(test_data_file, chunk_bytes))
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == test_data_file.stat().st_size
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+        lines = [line for start, end in ranges for line in read_line_chunk(test_data_file, start, end)]
+        with open(test_data_file, encoding="utf-8", errors="replace") as f:
+            assert lines == f.readlines()
+
+    def test_empty_and_unterminated_files(self, tmp_path):
+        """An empty file yields no ranges; a missing final newline is kept."""
+        empty = tmp_path / "empty.log"
+        empty.write_bytes(b"")
+        assert list(chunk_byte_ranges(empty, 10)) == []
+
+        partial = tmp_path / "partial.log"
+        partial.write_bytes(b"one\ntwo")
+        ranges = list(chunk_byte_ranges(partial, 2))
+        assert ranges == [(0, 4), (4, 7)]
+        assert read_line_chunk(partial, *ranges[1]) == ["two"]
+
+    def test_auto_chunk_bytes_bounds(self):
+        """Chunk size scales with the log but stays within the bounds."""
+        assert auto_chunk_bytes(0, 4) == MIN_CHUNK_BYTES
+        assert auto_chunk_bytes(1 << 40, 4) == MAX_CHUNK_BYTES
+        mid = auto_chunk_bytes(1 << 30, 8)
+        assert MIN_CHUNK_BYTES < mid < MAX_CHUNK_BYTES
+        assert auto_chunk_bytes(1 << 30, 0) == MAX_CHUNK_BYTES
+
+    def test_decoding_matches_text_mode(self, tmp_path):
+        """Chunks decode like a text-mode read: universal newlines and
+        replacement of invalid UTF-8."""
+        log = tmp_path / "mixed.log"
+        log.write_bytes(b"crlf\r\nbare\rcr\nbad \xff byte\n")
+        lines = [line for start, end in chunk_byte_ranges(log, 1) for line in read_line_chunk(log, start, end)]
+        with open(log, encoding="utf-8", errors="replace") as f:
+            assert lines == f.readlines() == ["crlf\n", "bare\n", "cr\n", "bad \ufffd byte\n"]
+
+
+class TestChunkMerge:
+    """Per-chunk worker results merge to the same totals as a single chunk."""
+
+    def test_split_chunks_merge_to_whole(self, test_data_file):
+        lines = test_data_file.read_text().splitlines(keepends=True)
+        scan_date = datetime(2026, 1, 15)
+        parser = GPFSParser()
+
+        (whole_dirs, whole_stats), whole_hist, _ = _worker_scan_chunk((lines, parser, scan_date))
+
+        dirs, stats, hists = {}, {}, {}
+        for part in (lines[::2], lines[1::2]):
+            (w_dirs, w_stats), w_hist, _ = _worker_scan_chunk((part, parser, scan_date))
+            dirs.update(w_dirs)
+            for path, w in w_stats.items():
+                if path in stats:
+                    merge_dir_stats(stats[path], w)
+                else:
+                    stats[path] = w
+            merge_histograms(hists, w_hist)
+
+        assert dirs == whole_dirs
+        assert {p: a.__getstate__() for p, a in stats.items()} == {p: a.__getstate__() for p, a in whole_stats.items()}
+        assert {u: h.__getstate__() for u, h in hists.items()} == {u: h.__getstate__() for u, h in whole_hist.items()}
+
+    def test_worker_results_survive_pickle(self, test_data_file):
+        """Accumulators round-trip through pickle, as they do across the Pool."""
+        lines = test_data_file.read_text().splitlines(keepends=True)
+        result = _worker_scan_chunk((lines, GPFSParser(), datetime(2026, 1, 15)))
+        (dirs, stats), hists, count = result
+
+        (p_dirs, p_stats), p_hists, p_count = pickle.loads(pickle.dumps(result))
+
+        assert (p_dirs, p_count) == (dirs, count)
+        assert {p: a.__getstate__() for p, a in p_stats.items()} == {p: a.__getstate__() for p, a in stats.items()}
+        assert {u: h.__getstate__() for u, h in p_hists.items()} == {u: h.__getstate__() for u, h in hists.items()}
+
+
 # ============================================================================
 # Histogram Import Tests
 # ============================================================================
@@ -193,6 +311,103 @@ class TestHistogramImport:
         session.close()
         engine.dispose()
 
+    def test_import_indexes_and_analyzes(self, test_data_file, tmp_path):
+        """Import builds the query indexes and leaves planner statistics."""
+        db_path = tmp_path / "test.db"
+        run_import(
+            input_file=test_data_file,
+            parser=GPFSParser(),
+            filesystem="test",
+            db_path=db_path,
+        )
+        clear_engine_cache()
+
+        engine = create_engine(f"sqlite:///{db_path}")
+        with engine.connect() as conn:
+            indexes = {row[0] for row in conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='index'"
+            ))}
+            assert {"uq_dir_parent_name", "ix_directories_depth_name",
+                    "ix_directories_depth_parent",
+                    "ix_stats_owner_uid", "ix_stats_max_atime_r",
+                    "ix_stats_single_owner_size"} <= indexes
+
+            # init_db lays the file out with the import page size
+            assert conn.execute(text("PRAGMA page_size")).scalar() == 16384
+
+            stat_tables = {row[0] for row in conn.execute(text(
+                "SELECT DISTINCT tbl FROM sqlite_stat1"
+            ))}
+            assert {"directories", "directory_stats"} <= stat_tables
+
+            plan = " ".join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT dir_id FROM directories "
+                "WHERE parent_id = 1 AND name = 'x'"
+            )))
+            assert "USING" in plan and "INDEX" in plan
+        engine.dispose()
+
+    def test_reimport_applies_page_size(self, test_data_file, tmp_path):
+        """Importing over an existing 4KB-page file re-lays it with 16KB pages."""
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA page_size = 4096")
+        conn.execute("CREATE TABLE directories (dir_id INTEGER PRIMARY KEY)")
+        conn.commit()
+        conn.close()
+
+        run_import(
+            input_file=test_data_file,
+            parser=GPFSParser(),
+            filesystem="test",
+            db_path=db_path,
+        )
+        clear_engine_cache()
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 16384
+        assert conn.execute("SELECT COUNT(*) FROM directories").fetchone()[0] > 0
+        conn.close()
+
+    def test_pass1_file_count_skips_orphan_parents(self, test_data_file, tmp_path):
+        """Files under a directory missing from the log are not counted."""
+        log = tmp_path / "orphan.log"
+        orphan = (
+            "<0> 400 1 0 s=64 a=8 u=1000 g=1000 m=FAu p=-rw-r--r-- "
+            "ac=2026-01-15 10:00:00 mt=2026-01-15 10:00:00 cr=2026-01-15 10:00:00 "
+            "nl=1 -- /gpfs/test/missing/orphan.txt\n"
+        )
+        log.write_text(test_data_file.read_text() + orphan)
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        stats_by_id, metadata, _ = pass1_discover_directories(
+            log, GPFSParser(), session, scan_date=datetime(2026, 1, 15)
+        )
+
+        assert metadata["file_count"] == 5
+        assert sum(s.nr_count for s in stats_by_id if s is not None) == 5
+        session.close()
+        engine.dispose()
+
+    def test_import_profile_writes_stats_per_pass(self, test_data_file, tmp_path):
+        """profile=True leaves a loadable cProfile dump for each pass."""
+        import pstats
+
+        db_path = tmp_path / "test.db"
+        run_import(
+            input_file=test_data_file,
+            parser=GPFSParser(),
+            filesystem="test",
+            db_path=db_path,
+            profile=True,
+        )
+        clear_engine_cache()
+
+        for stage in ("pass1", "pass2a", "pass2b", "pass2c", "pass3"):
+            pstats.Stats(str(tmp_path / f"test.{stage}.prof"))
+
     def test_histogram_data_collected(self, test_data_file, tmp_path):
         """Test that histogram data is correctly collected."""
         db_path = tmp_path / "test.db"
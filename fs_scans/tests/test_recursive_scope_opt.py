@@ -271,3 +271,36 @@ def test_size_histogram_parity(fast_session, slow_session, prefixes):
 def test_nonexistent_scope_returns_empty(fast_session):
     assert query_owner_summary(fast_session, path_prefixes=["/fs/coll/nope"]) == []
     assert query_directories(fast_session, path_prefixes=["/fs/coll/nope"]) == []
+
+
+@pytest.mark.parametrize(
+    "excludes",
+    [["/fs/coll/p1/sub"], ["/fs/coll/p2", "/fs/coll/p1/u2"], [_DEEP_SCOPE_OUT_OF_BAND]],
+)
+def test_list_directories_exclude_parity(fast_session, slow_session, excludes):
+    fast = query_directories(fast_session, exclude_paths=excludes, sort_by="size_r")
+    slow = query_directories(slow_session, exclude_paths=excludes, sort_by="size_r")
+    assert fast == slow
+    # Excluded subtrees (roots included) are gone; nothing else is.
+    everything = query_directories(slow_session, sort_by="size_r")
+    kept = [
+        d for d in everything
+        if not any(d["path"] == e or d["path"].startswith(e + "/") for e in excludes)
+    ]
+    assert fast == kept
+
+
+def test_depth_bounded_walk_matches_unbounded(slow_session):
+    # max_depth stops the recursive walk early; results must equal filtering
+    # the full walk by depth.
+    full = query_directories(slow_session, path_prefixes=["/fs/coll/p1"], sort_by="path")
+    bounded = query_directories(
+        slow_session, path_prefixes=["/fs/coll/p1"], max_depth=6, sort_by="path"
+    )
+    assert bounded == [d for d in full if d["depth"] <= 6]
+    for prefixes in (["/fs/coll/p1"], [_DEEP_SCOPE_OUT_OF_BAND]):
+        assert query_owner_summary(
+            slow_session, path_prefixes=prefixes, max_depth=10
+        ) == query_owner_summary(
+            _make_session(run_pass2c=True), path_prefixes=prefixes, max_depth=10
+        )